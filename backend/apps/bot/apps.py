@@ -1,7 +1,44 @@
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
+
+
+def _forget_cached_category(sender, instance, **kwargs):
+    from .services.transaction_service import TransactionService
+
+    TransactionService.forget_category(instance.pk)
 
 
 class BotConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.bot'
     verbose_name = 'Telegram Bot'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from apps.categories.models import Category
+        from .utils.translations import t
+
+        # Кэши переводов и клавиатур заполняем сразу (это быстро, без I/O)
+        t.warm_up()
+
+        # Переименованная или удалённая категория не должна оставаться в кэше pk
+        post_save.connect(
+            _forget_cached_category, sender=Category, dispatch_uid='bot_forget_category_on_save'
+        )
+        post_delete.connect(
+            _forget_cached_category, sender=Category, dispatch_uid='bot_forget_category_on_delete'
+        )
+
+        # Прогреваем Whisper в фоне, чтобы первое голосовое не ждало загрузки модели.
+        # Включается явно: management-командам (migrate и т.п.) модель не нужна
+        if getattr(settings, 'WHISPER_PREWARM', False):
+            from services.ai.voice_recognition.whisper_service import whisper_service
+
+            threading.Thread(
+                target=whisper_service.warm_up,
+                name='whisper-warm-up',
+                daemon=True
+            ).start()
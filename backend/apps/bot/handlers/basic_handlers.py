@@ -13,6 +13,7 @@ from ..models import TelegramUser, BotSession
 from ..services.telegram_api_service import TelegramAPIService
 from ..services.user_service import UserService
 from ..services.transaction_service import TransactionService
+from ..services.text_parser_service import text_parser_service
 from ..utils.translations import t
 
 logger = logging.getLogger(__name__)
@@ -361,11 +362,8 @@ class BasicHandlers:
         try:
             logger.info(f"Attempting to parse text: '{text}' for user {chat_id} (language: {user.language})")
             
-            from ..services.text_parser_service import TextParserService
-            
-            parser = TextParserService()
             # Используем асинхронный парсинг с конвертацией валют
-            parsed_data = await parser.parse_transaction_text(
+            parsed_data = await text_parser_service.parse_transaction_text(
                 text, 
                 user.language, 
                 user.preferred_currency
@@ -403,10 +401,7 @@ class BasicHandlers:
         try:
             logger.info(f"Checking for management command: '{text}' for user {chat_id}")
             
-            from ..services.text_parser_service import TextParserService
-            
-            parser = TextParserService()
-            management_data = parser.parse_management_command(text, user.language)
+            management_data = text_parser_service.parse_management_command(text, user.language)
             
             if management_data:
                 logger.info(f"Management command detected: {management_data}")
@@ -496,7 +491,7 @@ class BasicHandlers:
         except Exception as e:
             logger.error(f"Error handling voice currency change: {e}")
 
-    async def _handle_voice_category_creation(self, chat_id: int, category_name: str, user: TelegramUser) -> None:
+    async def _handle_voice_category_creation(self, chat_id: int, category_name: str, user: TelegramUser, message_id: Optional[int] = None) -> None:
         """Обрабатывает голосовую команду создания категории"""
         try:
             # Получаем Django пользователя
@@ -507,16 +502,18 @@ class BasicHandlers:
             
             if category_created:
                 success_text = t.get_text('category_created', user.language)
-                await self.telegram_api.send_message(
+                await self.telegram_api.send_or_edit_message(
                     chat_id=chat_id,
+                    message_id=message_id,
                     text=f"✅ {success_text}: **{category_name}**",
                     parse_mode='Markdown'
                 )
                 logger.info(f"Category '{category_name}' created via voice command for user {chat_id}")
             else:
                 error_text = t.get_text('category_exists', user.language)
-                await self.telegram_api.send_message(
+                await self.telegram_api.send_or_edit_message(
                     chat_id=chat_id,
+                    message_id=message_id,
                     text=f"⚠️ {error_text}: **{category_name}**",
                     parse_mode='Markdown'
                 )
@@ -524,12 +521,13 @@ class BasicHandlers:
         except Exception as e:
             logger.error(f"Error handling voice category creation: {e}")
             error_text = t.get_text('processing_failed', user.language)
-            await self.telegram_api.send_message(
+            await self.telegram_api.send_or_edit_message(
                 chat_id=chat_id,
+                message_id=message_id,
                 text=f"❌ {error_text}"
             )
 
-    async def _handle_voice_category_deletion(self, chat_id: int, category_name: str, user: TelegramUser) -> None:
+    async def _handle_voice_category_deletion(self, chat_id: int, category_name: str, user: TelegramUser, message_id: Optional[int] = None) -> None:
         """Обрабатывает голосовую команду удаления категории"""
         try:
             # Получаем Django пользователя
@@ -540,16 +538,18 @@ class BasicHandlers:
             
             if category_deleted:
                 success_text = t.get_text('category_deleted', user.language) if hasattr(t, 'category_deleted') else 'Категория удалена'
-                await self.telegram_api.send_message(
+                await self.telegram_api.send_or_edit_message(
                     chat_id=chat_id,
+                    message_id=message_id,
                     text=f"✅ {success_text}: **{category_name}**",
                     parse_mode='Markdown'
                 )
                 logger.info(f"Category '{category_name}' deleted via voice command for user {chat_id}")
             else:
                 error_text = t.get_text('category_not_found', user.language) if hasattr(t, 'category_not_found') else 'Категория не найдена'
-                await self.telegram_api.send_message(
+                await self.telegram_api.send_or_edit_message(
                     chat_id=chat_id,
+                    message_id=message_id,
                     text=f"⚠️ {error_text}: **{category_name}**",
                     parse_mode='Markdown'
                 )
@@ -557,12 +557,13 @@ class BasicHandlers:
         except Exception as e:
             logger.error(f"Error handling voice category deletion: {e}")
             error_text = t.get_text('processing_failed', user.language)
-            await self.telegram_api.send_message(
+            await self.telegram_api.send_or_edit_message(
                 chat_id=chat_id,
+                message_id=message_id,
                 text=f"❌ {error_text}"
             )
 
-    async def _handle_voice_transaction_deletion(self, chat_id: int, target: str, user: TelegramUser) -> None:
+    async def _handle_voice_transaction_deletion(self, chat_id: int, target: str, user: TelegramUser, message_id: Optional[int] = None) -> None:
         """Обрабатывает голосовую команду удаления транзакции"""
         try:
             # Получаем Django пользователя
@@ -573,16 +574,18 @@ class BasicHandlers:
             
             if transaction_deleted:
                 success_text = t.get_text('transaction_deleted', user.language) if hasattr(t, 'transaction_deleted') else 'Транзакция удалена'
-                await self.telegram_api.send_message(
+                await self.telegram_api.send_or_edit_message(
                     chat_id=chat_id,
+                    message_id=message_id,
                     text=f"✅ {success_text}: **{target}**",
                     parse_mode='Markdown'
                 )
                 logger.info(f"Transaction '{target}' deleted via voice command for user {chat_id}")
             else:
                 error_text = t.get_text('transaction_not_found', user.language) if hasattr(t, 'transaction_not_found') else 'Транзакция не найдена'
-                await self.telegram_api.send_message(
+                await self.telegram_api.send_or_edit_message(
                     chat_id=chat_id,
+                    message_id=message_id,
                     text=f"⚠️ {error_text}: **{target}**",
                     parse_mode='Markdown'
                 )
@@ -590,8 +593,9 @@ class BasicHandlers:
         except Exception as e:
             logger.error(f"Error handling voice transaction deletion: {e}")
             error_text = t.get_text('processing_failed', user.language)
-            await self.telegram_api.send_message(
+            await self.telegram_api.send_or_edit_message(
                 chat_id=chat_id,
+                message_id=message_id,
                 text=f"❌ {error_text}"
             )
 
@@ -145,15 +145,15 @@ class PhotoHandlers:
             if not file_info or 'file_path' not in file_info:
                 return None
             
-            # Скачиваем файл
-            file_content = await self.telegram_api.download_file(file_info['file_path'])
-            if not file_content:
+            # Скачиваем файл сразу во временный файл, блоками, без копии в памяти
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as temp_file:
+                downloaded = await self.telegram_api.download_file_to(file_info['file_path'], temp_file)
+            
+            if not downloaded or not os.path.getsize(temp_file.name):
+                os.unlink(temp_file.name)
                 return None
             
-            # Сохраняем во временный файл
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as temp_file:
-                temp_file.write(file_content)
-                return temp_file.name
+            return temp_file.name
             
         except Exception as e:
             logger.error(f"Error downloading photo file {file_id}: {e}")
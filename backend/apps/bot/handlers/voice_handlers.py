@@ -3,32 +3,76 @@
 Поддержка мультиязычности интерфейса
 """
 
+import asyncio
 import logging
-import os
-import tempfile
 from typing import Dict, Any, Optional
+import aiohttp
 from django.conf import settings
+from django.db import DatabaseError
 
 from ..models import TelegramUser, VoiceCommand
 from ..services.telegram_api_service import TelegramAPIService
 from ..services.user_service import UserService
 from ..services.transaction_service import TransactionService
+from ..services.text_parser_service import text_parser_service
 from ..services.voice_parser_service import VoiceParserService
 from ..utils.translations import t
-from services.ai.voice_recognition.whisper_service import WhisperService
+from services.ai.voice_recognition.whisper_service import whisper_service
 
 logger = logging.getLogger(__name__)
 
+# Шаблоны ответов голосового обработчика, выбранные заранее для каждого языка
+VOICE_TEMPLATE_KEYS = (
+    'voice_processing',
+    'voice_no_transaction',
+    'voice_transaction_created',
+    'voice_error',
+)
+
+VOICE_TEMPLATES = {
+    language: {key: t.get_text(key, language) for key in VOICE_TEMPLATE_KEYS}
+    for language in t.TRANSLATIONS
+}
+
+
+class VoiceProcessingError(Exception):
+    """Ожидаемая ошибка обработки голосового сообщения (скачивание, распознавание, сохранение)"""
+
+
+# Ожидаемые ошибки: логируются без трассировки. Прочие исключения тоже
+# перехватываются (с трассировкой), asyncio.CancelledError пробрасывается дальше
+VOICE_HANDLED_ERRORS = (
+    VoiceProcessingError,
+    DatabaseError,
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+    OSError,
+)
+
+
+def get_voice_template(key: str, language: str) -> str:
+    """Возвращает заранее подготовленный шаблон ответа (с фолбэком на русский)"""
+    return VOICE_TEMPLATES.get(language, VOICE_TEMPLATES['ru'])[key]
+
 
 class VoiceHandlers:
     """Обработчики голосовых сообщений бота"""
     
+    # Экземпляр создаётся на каждое обновление - обходимся без __dict__
+    __slots__ = (
+        'telegram_api',
+        'user_service',
+        'transaction_service',
+        'voice_parser',
+        'whisper_service',
+    )
+    
     def __init__(self):
         self.telegram_api = TelegramAPIService()
         self.user_service = UserService()
         self.transaction_service = TransactionService()
         self.voice_parser = VoiceParserService()
-        self.whisper_service = WhisperService()
+        self.whisper_service = whisper_service
     
     async def handle_voice_message(self, update: Dict[str, Any]) -> None:
         """
@@ -39,6 +83,8 @@ class VoiceHandlers:
         """
         chat_id = None
         voice_log = None
+        language = 'ru'
+        processing_message_id = None
         
         try:
             message = update.get('message', {})
@@ -52,7 +98,7 @@ class VoiceHandlers:
             # Получаем пользователя и язык
             user = await self.user_service.get_user_by_chat_id(chat_id)
             if not user:
-                logger.error(f"User not found for chat_id: {chat_id}")
+                logger.error("User not found for chat_id: %s", chat_id)
                 return
             
             language = user.language
@@ -66,127 +112,128 @@ class VoiceHandlers:
             )
             
             # Отправляем сообщение о начале обработки
-            processing_text = t.get_text('voice_processing', language)
+            processing_text = get_voice_template('voice_processing', language)
             processing_message = await self.telegram_api.send_message(
                 chat_id=chat_id,
                 text=processing_text
             )
             processing_message_id = processing_message.get('message_id') if processing_message else None
             
-            # 1. Скачиваем аудио файл
-            audio_file_path = await self._download_voice_file(voice.get('file_id'), chat_id)
-            if not audio_file_path:
-                raise Exception("Не удалось скачать аудио файл")
+            # 1. Скачиваем аудио в память
+            audio_bytes = await self._download_voice_file(voice.get('file_id'), chat_id)
+            if not audio_bytes:
+                raise VoiceProcessingError("Не удалось скачать аудио файл")
             
-            try:
-                # 2. Распознаём речь с помощью Whisper
-                transcription_result = await self.whisper_service.transcribe_audio(
-                    audio_file_path, 
-                    language=language
-                )
-                
-                if not transcription_result or not transcription_result.get('text'):
-                    raise Exception("Не удалось распознать речь")
-                
-                transcription = transcription_result['text']
-                
-                # Обновляем транскрипцию
-                voice_log.transcription = transcription
+            # 2. Распознаём речь с помощью Whisper (без записи на диск)
+            transcription_result = await self.whisper_service.transcribe_audio_bytes(
+                audio_bytes, 
+                language=language
+            )
+            
+            if not transcription_result or not transcription_result.get('text'):
+                raise VoiceProcessingError("Не удалось распознать речь")
+            
+            transcription = transcription_result['text']
+            
+            # Обновляем транскрипцию
+            voice_log.transcription = transcription
+            await voice_log.asave()
+            
+            logger.info("Transcribed: '%s' for user %s", transcription, chat_id)
+            
+            # 3. Сначала проверяем команды управления
+            management_data = text_parser_service.parse_management_command(transcription, language)
+            
+            if management_data:
+                # Обрабатываем команду управления
+                voice_log.status = 'success'
+                voice_log.command_type = management_data['type']
                 await voice_log.asave()
                 
-                logger.info(f"Transcribed: '{transcription}' for user {chat_id}")
-                
-                # 3. Сначала проверяем команды управления
-                from ..services.text_parser_service import TextParserService
-                text_parser = TextParserService()
-                management_data = text_parser.parse_management_command(transcription, language)
-                
-                if management_data:
-                    # Обрабатываем команду управления
-                    voice_log.status = 'success'
-                    voice_log.command_type = management_data['type']
-                    await voice_log.asave()
-                    
-                    success = await self._handle_voice_management_command(
-                        chat_id, management_data, user, processing_message_id
-                    )
-                    
-                    if success:
-                        return
-                
-                # 4. Если не команда управления - парсим транзакцию
-                parsed_data = self.voice_parser.parse_voice_text(transcription, language)
+                success = await self._handle_voice_management_command(
+                    chat_id, management_data, user, processing_message_id
+                )
                 
-                if not parsed_data:
-                    # Если не удалось распознать транзакцию - просто сохраняем текст
-                    voice_log.status = 'success'
-                    voice_log.command_type = 'unknown'
-                    await voice_log.asave()
-                    
-                    no_transaction_text = t.get_text('voice_no_transaction', language)
-                    final_text = f"{no_transaction_text}\n\n📝 *Распознано:* {transcription}"
-                    
-                    # Обновляем исходное сообщение
-                    if processing_message_id:
-                        await self.telegram_api.edit_message_text(
-                            chat_id=chat_id,
-                            message_id=processing_message_id,
-                            text=final_text,
-                            parse_mode='Markdown'
-                        )
-                    else:
-                        await self.telegram_api.send_message(
-                            chat_id=chat_id,
-                            text=final_text,
-                            parse_mode='Markdown'
-                        )
+                if success:
                     return
+            
+            # 4. Если не команда управления - парсим транзакцию
+            parsed_data = self.voice_parser.parse_voice_text(transcription, language)
+            
+            if not parsed_data:
+                # Если не удалось распознать транзакцию - просто сохраняем текст
+                voice_log.status = 'success'
+                voice_log.command_type = 'unknown'
+                await voice_log.asave()
+                
+                no_transaction_text = get_voice_template('voice_no_transaction', language)
+                final_text = f"{no_transaction_text}\n\n📝 *Распознано:* {transcription}"
                 
-                # 4. Создаём транзакцию
-                transaction = await self.transaction_service.create_transaction_from_voice(
-                    chat_id, parsed_data
+                # Обновляем исходное сообщение
+                await self.telegram_api.send_or_edit_message(
+                    chat_id=chat_id,
+                    text=final_text,
+                    message_id=processing_message_id,
+                    parse_mode='Markdown'
                 )
+                return
+            
+            # 4. Создаём транзакцию
+            transaction = await self.transaction_service.create_transaction_from_voice(
+                chat_id, parsed_data
+            )
+            
+            if transaction:
+                # Успешно создана транзакция
+                voice_log.status = 'success'
+                voice_log.command_type = parsed_data['type']
+                voice_log.extracted_amount = parsed_data['amount']
+                voice_log.created_transaction_id = transaction.id
+                await voice_log.asave()
                 
-                if transaction:
-                    # Успешно создана транзакция
-                    voice_log.status = 'success'
-                    voice_log.command_type = parsed_data['type']
-                    voice_log.extracted_amount = parsed_data['amount']
-                    voice_log.created_transaction_id = transaction.id
-                    await voice_log.asave()
-                    
-                    # Отправляем подтверждение (обновляем исходное сообщение)
-                    await self._send_transaction_confirmation(
-                        chat_id, transaction, parsed_data, language, processing_message_id
-                    )
-                    
-                else:
-                    raise Exception("Не удалось создать транзакцию")
+                # Отправляем подтверждение (обновляем исходное сообщение)
+                await self._send_transaction_confirmation(
+                    chat_id, transaction, parsed_data, language, processing_message_id
+                )
                 
-            finally:
-                # Удаляем временный файл
-                if audio_file_path and os.path.exists(audio_file_path):
-                    os.unlink(audio_file_path)
+            else:
+                raise VoiceProcessingError("Не удалось создать транзакцию")
             
-            logger.info(f"Successfully processed voice message for user {chat_id}")
+            logger.info("Successfully processed voice message for user %s", chat_id)
             
+        except asyncio.CancelledError:
+            raise
+        except VOICE_HANDLED_ERRORS as e:
+            logger.error("Error in handle_voice_message: %s", e)
+            await self._fail_voice_processing(voice_log, chat_id, language, processing_message_id, e)
         except Exception as e:
-            logger.error(f"Error in handle_voice_message: {e}")
-            
-            # Обновляем статус ошибки
-            if voice_log:
-                voice_log.status = 'failed'
-                voice_log.error_message = str(e)
-                await voice_log.asave()
-            
-            # Отправляем сообщение об ошибке
-            if chat_id:
-                user = await self.user_service.get_user_by_chat_id(chat_id)
-                language = user.language if user else 'ru'
-                await self._send_error_message(chat_id, language)
+            logger.exception("Unexpected error in handle_voice_message: %s", e)
+            await self._fail_voice_processing(voice_log, chat_id, language, processing_message_id, e)
+    
+    async def _fail_voice_processing(
+        self,
+        voice_log: Optional[VoiceCommand],
+        chat_id: Optional[int],
+        language: str,
+        processing_message_id: Optional[int],
+        error: Exception
+    ) -> None:
+        """Помечает голосовую команду как неудачную и сообщает пользователю об ошибке"""
+        # Обновляем статус ошибки
+        if voice_log:
+            voice_log.status = 'failed'
+            voice_log.error_message = str(error)
+            try:
+                await voice_log.asave(update_fields=['status', 'error_message'])
+            except DatabaseError as save_error:
+                logger.error("Failed to save voice log status: %s", save_error)
+        
+        # Отправляем сообщение об ошибке (язык уже известен, повторно пользователя не читаем)
+        if chat_id:
+            await self._send_error_message(chat_id, language, processing_message_id)
     
-    async def _download_voice_file(self, file_id: str, chat_id: int) -> Optional[str]:
-        """Скачивает голосовой файл от Telegram"""
+    async def _download_voice_file(self, file_id: str, chat_id: int) -> Optional[bytes]:
+        """Скачивает голосовой файл от Telegram в память"""
         try:
             # Получаем информацию о файле
             file_info = await self.telegram_api.get_file_info(file_id)
@@ -198,13 +245,11 @@ class VoiceHandlers:
             if not file_content:
                 return None
             
-            # Сохраняем во временный файл
-            with tempfile.NamedTemporaryFile(suffix='.ogg', delete=False) as temp_file:
-                temp_file.write(file_content)
-                return temp_file.name
+            # Голосовые сообщения небольшие - держим их в памяти, а не на диске
+            return file_content
                 
-        except Exception as e:
-            logger.error(f"Error downloading voice file: {e}")
+        except (aiohttp.ClientError, asyncio.TimeoutError, KeyError) as e:
+            logger.error("Error downloading voice file: %s", e)
             return None
     
     async def _send_transaction_confirmation(
@@ -218,14 +263,15 @@ class VoiceHandlers:
         """Отправляет подтверждение о созданной транзакции"""
         try:
             transaction_type = '💰 Доход' if transaction.type == 'income' else '💸 Расход'
-            amount_text = f"{transaction.amount:,.0f}"
+            # round() у Decimal даёт int с тем же банковским округлением, что и ',.0f'
+            amount_text = format(round(transaction.amount), ',d')
             
             if transaction.category:
                 category_text = transaction.category.name
             else:
                 category_text = parsed_data.get('category', 'Без категории')
             
-            confirmation_text = t.get_text('voice_transaction_created', language).format(
+            confirmation_text = get_voice_template('voice_transaction_created', language).format(
                 type=transaction_type,
                 amount=amount_text,
                 category=category_text,
@@ -233,22 +279,15 @@ class VoiceHandlers:
             )
             
             # Обновляем исходное сообщение или отправляем новое
-            if processing_message_id:
-                await self.telegram_api.edit_message_text(
-                    chat_id=chat_id,
-                    message_id=processing_message_id,
-                    text=confirmation_text,
-                    parse_mode='Markdown'
-                )
-            else:
-                await self.telegram_api.send_message(
-                    chat_id=chat_id,
-                    text=confirmation_text,
-                    parse_mode='Markdown'
-                )
+            await self.telegram_api.send_or_edit_message(
+                chat_id=chat_id,
+                text=confirmation_text,
+                message_id=processing_message_id,
+                parse_mode='Markdown'
+            )
             
         except Exception as e:
-            logger.error(f"Error sending transaction confirmation: {e}")
+            logger.error("Error sending transaction confirmation: %s", e)
 
     async def _handle_voice_management_command(
         self, 
@@ -295,7 +334,8 @@ class VoiceHandlers:
                 basic_handler = BasicHandlers()
                 
                 await basic_handler._handle_voice_category_creation(
-                    chat_id, management_data['category_name'], user
+                    chat_id, management_data['category_name'], user,
+                    message_id=processing_message_id
                 )
                 return True
                 
@@ -305,7 +345,8 @@ class VoiceHandlers:
                 basic_handler = BasicHandlers()
                 
                 await basic_handler._handle_voice_category_deletion(
-                    chat_id, management_data['category_name'], user
+                    chat_id, management_data['category_name'], user,
+                    message_id=processing_message_id
                 )
                 return True
                 
@@ -315,7 +356,8 @@ class VoiceHandlers:
                 basic_handler = BasicHandlers()
                 
                 await basic_handler._handle_voice_transaction_deletion(
-                    chat_id, management_data['target'], user
+                    chat_id, management_data['target'], user,
+                    message_id=processing_message_id
                 )
                 return True
             
@@ -323,39 +365,39 @@ class VoiceHandlers:
                 return False
             
             # Отправляем подтверждение (для команд смены языка/валюты)
-            if processing_message_id:
-                await self.telegram_api.edit_message_text(
-                    chat_id=chat_id,
-                    message_id=processing_message_id,
-                    text=confirmation,
-                    parse_mode='Markdown'
-                )
-            else:
-                await self.telegram_api.send_message(
-                    chat_id=chat_id,
-                    text=confirmation,
-                    parse_mode='Markdown'
-                )
+            await self.telegram_api.send_or_edit_message(
+                chat_id=chat_id,
+                text=confirmation,
+                message_id=processing_message_id,
+                parse_mode='Markdown'
+            )
                 
             return True
             
         except Exception as e:
-            logger.error(f"Error handling voice management command: {e}")
+            logger.error("Error handling voice management command: %s", e)
             return False
     
-    async def _send_error_message(self, chat_id: int, language: str = 'ru') -> None:
+    async def _send_error_message(
+        self, 
+        chat_id: int, 
+        language: str = 'ru', 
+        message_id: Optional[int] = None
+    ) -> None:
         """
         Отправляет сообщение об ошибке пользователю
         
         Args:
             chat_id: ID чата
             language: Язык сообщения
+            message_id: Сообщение "Обрабатываю...", которое заменяется ошибкой
         """
         try:
-            error_text = t.get_text('voice_error', language)
-            await self.telegram_api.send_message(
+            error_text = get_voice_template('voice_error', language)
+            await self.telegram_api.send_or_edit_message(
                 chat_id=chat_id,
-                text=error_text
+                text=error_text,
+                message_id=message_id
             )
         except Exception as e:
-            logger.error(f"Failed to send error message: {e}") 
\ No newline at end of file
+            logger.error("Failed to send error message: %s", e) 
\ No newline at end of file
@@ -3,11 +3,43 @@ Django management команда для инициализации AI серви
 """
 
 import asyncio
+import importlib.util
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 
 
+# Статичные блоки справки собираются один раз при импорте и выводятся одним write()
+INSTALL_STEPS = '\n'.join([
+    '=' * 50,
+    '1. Обновите pip:',
+    '   pip install --upgrade pip',
+    '',
+    '2. Установите все зависимости:',
+    '   pip install -r requirements.txt',
+    '',
+    '3. Для работы с видео/аудио установите ffmpeg:',
+    '   # macOS:',
+    '   brew install ffmpeg',
+    '',
+    '   # Ubuntu/Debian:',
+    '   sudo apt update && sudo apt install ffmpeg',
+    '',
+    '4. Проверьте установку:',
+    '   python manage.py init_ai_services --check-only',
+    '',
+]) + '\n'
+
+SYSTEM_REQUIREMENTS = '\n'.join([
+    '- Python 3.8+',
+    '- 4GB+ RAM',
+    '- 2GB+ свободного места',
+    '- ffmpeg для обработки аудио/видео',
+    '',
+]) + '\n'
+
+
 class Command(BaseCommand):
     help = 'Инициализирует и проверяет все AI сервисы OvozPay'
     
@@ -85,102 +117,122 @@ class Command(BaseCommand):
         ]
         
         for import_name, package_name in deps_to_check:
-            try:
-                __import__(import_name)
+            if self._is_installed(import_name):
                 self.stdout.write(f'✅ {package_name}')
-            except ImportError:
+            else:
                 missing.append(package_name)
                 self.stdout.write(f'❌ {package_name}')
         
         return missing
     
+    @staticmethod
+    def _is_installed(import_name):
+        """
+        Проверяет, установлен ли модуль, не импортируя его
+        
+        find_spec только ищет модуль на sys.path и не выполняет его код -
+        easyocr, cv2 и whisper при импорте поднимают torch и занимают секунды.
+        """
+        return importlib.util.find_spec(import_name) is not None
+    
     def _check_services_status(self):
         """Проверяет статус AI сервисов"""
         self.stdout.write(
             self.style.HTTP_INFO('🔍 Проверяем AI сервисы...')
         )
         
-        # Проверяем импорт сервисов
+        # Сервисы независимы (диск, модели, сеть) - опрашиваем их параллельно,
+        # а вывод печатаем в фиксированном порядке
+        probes = (
+            self._probe_whisper_service,
+            self._probe_easyocr_service,
+            self._probe_nlp_service,
+            self._probe_currency_service,
+        )
+        
+        with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+            results = list(executor.map(lambda probe: probe(), probes))
+        
+        for lines in results:
+            for line in lines:
+                self.stdout.write(line)
+        
+        self.stdout.write('')
+        self.stdout.write(
+            self.style.SUCCESS('🎉 Проверка AI сервисов завершена!')
+        )
+    
+    def _probe_whisper_service(self):
+        """Проверяет WhisperService, возвращает строки для вывода"""
+        lines = []
         try:
             from services.ai.voice_recognition.whisper_service import whisper_service
-            self.stdout.write('✅ WhisperService импортирован')
+            lines.append('✅ WhisperService импортирован')
             
             status = whisper_service.get_service_status()
             if status.get('whisper_installed'):
-                self.stdout.write('✅ Whisper CLI доступен')
+                lines.append('✅ Whisper CLI доступен')
             else:
-                self.stdout.write('⚠️ Whisper CLI недоступен')
+                lines.append('⚠️ Whisper CLI недоступен')
                 
         except ImportError as e:
-            self.stdout.write(f'❌ WhisperService: {e}')
+            lines.append(f'❌ WhisperService: {e}')
         
+        return lines
+    
+    def _probe_easyocr_service(self):
+        """Проверяет EasyOCRService, возвращает строки для вывода"""
+        lines = []
         try:
             from services.ai.ocr.easyocr_service import easyocr_service
-            self.stdout.write('✅ EasyOCRService импортирован')
+            lines.append('✅ EasyOCRService импортирован')
             
             status = easyocr_service.get_service_status()
             if status.get('easyocr_available'):
-                self.stdout.write('✅ EasyOCR доступен')
+                lines.append('✅ EasyOCR доступен')
             else:
-                self.stdout.write('⚠️ EasyOCR недоступен')
+                lines.append('⚠️ EasyOCR недоступен')
                 
         except ImportError as e:
-            self.stdout.write(f'❌ EasyOCRService: {e}')
+            lines.append(f'❌ EasyOCRService: {e}')
         
+        return lines
+    
+    def _probe_nlp_service(self):
+        """Проверяет NLPService, возвращает строки для вывода"""
+        lines = []
         try:
             from services.ai.text_processing.nlp_service import nlp_service
-            self.stdout.write('✅ NLPService импортирован')
+            lines.append('✅ NLPService импортирован')
             
             status = nlp_service.get_service_status()
-            self.stdout.write(f'✅ NLP: {len(status.get("expense_categories", []))} категорий расходов')
+            lines.append(f'✅ NLP: {len(status.get("expense_categories", []))} категорий расходов')
             
         except ImportError as e:
-            self.stdout.write(f'❌ NLPService: {e}')
+            lines.append(f'❌ NLPService: {e}')
         
+        return lines
+    
+    def _probe_currency_service(self):
+        """Проверяет CurrencyService, возвращает строки для вывода"""
+        lines = []
         try:
             from services.currency_service import currency_service
-            self.stdout.write('✅ CurrencyService импортирован')
+            lines.append('✅ CurrencyService импортирован')
             
         except ImportError as e:
-            self.stdout.write(f'❌ CurrencyService: {e}')
+            lines.append(f'❌ CurrencyService: {e}')
         
-        self.stdout.write('')
-        self.stdout.write(
-            self.style.SUCCESS('🎉 Проверка AI сервисов завершена!')
-        )
+        return lines
     
     def _show_installation_instructions(self):
         """Показывает инструкции по установке"""
         self.stdout.write(
             self.style.HTTP_INFO('📦 УСТАНОВКА ЗАВИСИМОСТЕЙ ДЛЯ AI СЕРВИСОВ')
         )
-        self.stdout.write('=' * 50)
-        
-        self.stdout.write('1. Обновите pip:')
-        self.stdout.write('   pip install --upgrade pip')
-        self.stdout.write('')
-        
-        self.stdout.write('2. Установите все зависимости:')
-        self.stdout.write('   pip install -r requirements.txt')
-        self.stdout.write('')
-        
-        self.stdout.write('3. Для работы с видео/аудио установите ffmpeg:')
-        self.stdout.write('   # macOS:')
-        self.stdout.write('   brew install ffmpeg')
-        self.stdout.write('')
-        self.stdout.write('   # Ubuntu/Debian:')
-        self.stdout.write('   sudo apt update && sudo apt install ffmpeg')
-        self.stdout.write('')
-        
-        self.stdout.write('4. Проверьте установку:')
-        self.stdout.write('   python manage.py init_ai_services --check-only')
-        self.stdout.write('')
+        self.stdout.write(INSTALL_STEPS)
         
         self.stdout.write(
             self.style.WARNING('⚠️ СИСТЕМНЫЕ ТРЕБОВАНИЯ:')
         )
-        self.stdout.write('- Python 3.8+')
-        self.stdout.write('- 4GB+ RAM')
-        self.stdout.write('- 2GB+ свободного места')
-        self.stdout.write('- ffmpeg для обработки аудио/видео')
-        self.stdout.write('')
+        self.stdout.write(SYSTEM_REQUIREMENTS)
@@ -1,7 +1,6 @@
-import asyncio
 from django.core.management.base import BaseCommand
 from django.conf import settings
-from apps.bot.telegram.services.telegram_api_service import TelegramAPIService
+from apps.bot.utils.event_loop import run_async
 
 
 class Command(BaseCommand):
@@ -20,15 +19,9 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        telegram_service = TelegramAPIService()
-
-        if options['delete']:
-            self.stdout.write('Удаляем webhook...')
-            result = asyncio.run(telegram_service.delete_webhook())
-        else:
-            webhook_url = options['url'] or settings.TELEGRAM_WEBHOOK_URL
-            self.stdout.write(f'Устанавливаем webhook: {webhook_url}')
-            result = asyncio.run(telegram_service.set_webhook(webhook_url))
+        # Django 5.0 не поддерживает `async def handle`, поэтому вся асинхронная
+        # часть команды выполняется в одном event loop
+        result = run_async(self._handle_async(options))
 
         if result.get('ok'):
             if options['delete']:
@@ -43,4 +36,18 @@ class Command(BaseCommand):
             error_msg = result.get('description', 'Неизвестная ошибка')
             self.stdout.write(
                 self.style.ERROR(f'❌ Ошибка: {error_msg}')
-            ) 
\ No newline at end of file
+            )
+
+    async def _handle_async(self, options) -> dict:
+        """Асинхронная часть команды: установка или удаление webhook"""
+        from apps.bot.telegram.services.telegram_api_service import TelegramAPIService
+
+        telegram_service = TelegramAPIService()
+
+        if options['delete']:
+            self.stdout.write('Удаляем webhook...')
+            return await telegram_service.delete_webhook()
+
+        webhook_url = options['url'] or settings.TELEGRAM_WEBHOOK_URL
+        self.stdout.write(f'Устанавливаем webhook: {webhook_url}')
+        return await telegram_service.set_webhook(webhook_url)
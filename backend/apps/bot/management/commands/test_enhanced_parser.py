@@ -2,17 +2,27 @@
 Тестирование расширенного парсера с товарами и командами удаления
 """
 
+import asyncio
+
 from django.core.management.base import BaseCommand
-from apps.bot.services.text_parser_service import TextParserService
+from apps.bot.services.text_parser_service import text_parser_service
+from apps.bot.utils.command_output import buffered_output
+from apps.bot.utils.event_loop import run_async
 
 
 class Command(BaseCommand):
     help = 'Тестирует расширенный парсер товаров и команды удаления'
 
     def handle(self, *args, **options):
-        parser = TextParserService()
+        # Вывод пишется одним блоком в конце команды
+        with buffered_output(self):
+            self._handle(*args, **options)
+    
+    def _handle(self, *args, **options):
+        parser = text_parser_service
+        error = self.style.ERROR
         
-        self.stdout.write('\n🧪 ТЕСТИРОВАНИЕ РАСШИРЕННОГО ПАРСЕРА\n')
+        lines = ['\n🧪 ТЕСТИРОВАНИЕ РАСШИРЕННОГО ПАРСЕРА']
         
         # Тесты товаров и продуктов
         product_tests = [
@@ -28,16 +38,6 @@ class Command(BaseCommand):
             "заплатил за такси 15000 сум"
         ]
         
-        self.stdout.write('📦 ТЕСТИРОВАНИЕ ТОВАРОВ:')
-        for test_text in product_tests:
-            result = parser.parse_transaction_text(test_text, 'ru')
-            if result:
-                self.stdout.write(
-                    f"✅ '{test_text}' → {result['category']} | {result['amount']} {result['currency']}"
-                )
-            else:
-                self.stdout.write(self.style.ERROR(f"❌ '{test_text}' → Не распознано"))
-        
         # Тесты команд удаления
         delete_tests = [
             "удали категорию продукты",
@@ -50,18 +50,6 @@ class Command(BaseCommand):
             "tranzaksiyani o'chir sut"
         ]
         
-        self.stdout.write('\n🗑️ ТЕСТИРОВАНИЕ КОМАНД УДАЛЕНИЯ:')
-        for test_text in delete_tests:
-            result = parser.parse_management_command(test_text, 'ru')
-            if result:
-                command_type = result['type']
-                target = result.get('category_name') or result.get('target', 'неизвестно')
-                self.stdout.write(
-                    f"✅ '{test_text}' → {command_type} | {target}"
-                )
-            else:
-                self.stdout.write(self.style.ERROR(f"❌ '{test_text}' → Не распознано"))
-        
         # Тесты валют
         currency_tests = [
             "потратил 50 000 сум на продукты",
@@ -71,14 +59,44 @@ class Command(BaseCommand):
             "купил за 15 баксов сигареты"
         ]
         
-        self.stdout.write('\n💰 ТЕСТИРОВАНИЕ ВАЛЮТ:')
-        for test_text in currency_tests:
-            result = parser.parse_transaction_text(test_text, 'ru')
+        # Все три набора разбираются в одном event loop
+        async def parse_all():
+            return await asyncio.gather(
+                parser.parse_batch(product_tests, 'ru'),
+                parser.parse_batch(delete_tests, 'ru', kind='management'),
+                parser.parse_batch(currency_tests, 'ru'),
+            )
+        
+        product_results, delete_results, currency_results = run_async(parse_all())
+        
+        lines.append('📦 ТЕСТИРОВАНИЕ ТОВАРОВ:')
+        for test_text, result in zip(product_tests, product_results):
+            if result:
+                lines.append(
+                    f"✅ '{test_text}' → {result['category']} | {result['amount']} {result['currency']}"
+                )
+            else:
+                lines.append(error(f"❌ '{test_text}' → Не распознано"))
+        
+        lines.append('\n🗑️ ТЕСТИРОВАНИЕ КОМАНД УДАЛЕНИЯ:')
+        for test_text, result in zip(delete_tests, delete_results):
+            if result:
+                command_type = result['type']
+                target = result.get('category_name') or result.get('target', 'неизвестно')
+                lines.append(
+                    f"✅ '{test_text}' → {command_type} | {target}"
+                )
+            else:
+                lines.append(error(f"❌ '{test_text}' → Не распознано"))
+        
+        lines.append('\n💰 ТЕСТИРОВАНИЕ ВАЛЮТ:')
+        for test_text, result in zip(currency_tests, currency_results):
             if result:
-                self.stdout.write(
+                lines.append(
                     f"✅ '{test_text}' → {result['amount']} {result['currency']}"
                 )
             else:
-                self.stdout.write(self.style.ERROR(f"❌ '{test_text}' → Не распознано"))
+                lines.append(error(f"❌ '{test_text}' → Не распознано"))
         
-        self.stdout.write('\n✨ Тестирование завершено!') 
\ No newline at end of file
+        lines.append('\n✨ Тестирование завершено!')
+        self.stdout.write('\n'.join(lines)) 
\ No newline at end of file
@@ -3,7 +3,8 @@
 """
 
 from django.core.management.base import BaseCommand
-from apps.bot.services.text_parser_service import TextParserService
+from apps.bot.services.text_parser_service import text_parser_service
+from apps.bot.utils.command_output import buffered_output
 
 
 class Command(BaseCommand):
@@ -24,7 +25,12 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        parser = TextParserService()
+        # Вывод пишется одним блоком в конце команды
+        with buffered_output(self):
+            self._handle(*args, **options)
+    
+    def _handle(self, *args, **options):
+        parser = text_parser_service
         
         if options['text']:
             # Тестируем конкретный текст
@@ -2,16 +2,44 @@
 Команда для тестирования нового UI главного меню
 """
 
-import asyncio
 import logging
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 
-from apps.bot.services.telegram_api_service import TelegramAPIService
-from apps.bot.utils.translations import t
+from apps.bot.utils.event_loop import run_async
 
 logger = logging.getLogger(__name__)
 
+# Текст об обновлениях статичен - держим его на уровне модуля
+UPDATES_TEXT = """
+✅ **ОБНОВЛЕНИЯ UI ЗАВЕРШЕНЫ**
+
+🔄 **Что исправлено:**
+
+1. **Главное меню с кнопками**
+   📋 Полноценное интерактивное меню
+   💰 Баланс | 📊 История
+   📂 Категории | 🎯 Цели 
+   💸 Долги | ⚙️ Настройки
+   ❓ Помощь
+
+2. **Автообновление сообщений**
+   🎤 "Обрабатываю..." → результат
+   📝 Никакого засорения чата
+
+3. **Команды**
+   /menu - главное меню
+   /balance - баланс  
+   /settings - настройки
+   /help - справка
+
+4. **Голосовые сообщения**
+   ✅ Распознавание работает
+   🔄 Автоматическое редактирование
+   
+**Протестируйте все функции!** 🚀
+            """
+
 
 class Command(BaseCommand):
     """Команда для тестирования главного меню бота"""
@@ -52,73 +80,51 @@ class Command(BaseCommand):
             )
             
             # Запускаем асинхронную функцию
-            asyncio.run(self._test_menu_ui(chat_id, language))
+            run_async(self._test_menu_ui(chat_id, language))
             
         except Exception as e:
             raise CommandError(f"❌ Ошибка: {e}")
     
     async def _test_menu_ui(self, chat_id: int, language: str):
         """Асинхронное тестирование UI"""
+        # Импортируем здесь: aiohttp и таблицы переводов нужны только после
+        # проверки токена и аргументов
+        from apps.bot.services.telegram_api_service import TelegramAPIService
+        from apps.bot.utils.translations import t
         
         telegram_api = TelegramAPIService()
         
+        # 1. Приветствие
+        welcome_text = t.get_text('start_welcome', language)
+        
+        # 2. Главное меню
+        menu_text = t.get_text('main_menu', language)
+        
         try:
-            # 1. Отправляем приветствие
-            welcome_text = t.get_text('start_welcome', language)
-            await telegram_api.send_message(
-                chat_id=chat_id,
-                text=f"🧪 **ТЕСТ UI ОБНОВЛЕНИЯ**\n\n{welcome_text}",
-                parse_mode='Markdown'
-            )
-            
-            # 2. Отправляем главное меню
-            menu_text = t.get_text('main_menu', language)
-            await telegram_api.send_message(
-                chat_id=chat_id,
-                text=menu_text,
-                reply_markup=t.get_main_menu_keyboard(language)
-            )
-            
-            # 3. Отправляем информацию об обновлениях
-            updates_text = f"""
-✅ **ОБНОВЛЕНИЯ UI ЗАВЕРШЕНЫ**
-
-🔄 **Что исправлено:**
-
-1. **Главное меню с кнопками**
-   📋 Полноценное интерактивное меню
-   💰 Баланс | 📊 История
-   📂 Категории | 🎯 Цели 
-   💸 Долги | ⚙️ Настройки
-   ❓ Помощь
-
-2. **Автообновление сообщений**
-   🎤 "Обрабатываю..." → результат
-   📝 Никакого засорения чата
-
-3. **Команды**
-   /menu - главное меню
-   /balance - баланс  
-   /settings - настройки
-   /help - справка
-
-4. **Голосовые сообщения**
-   ✅ Распознавание работает
-   🔄 Автоматическое редактирование
-   
-**Протестируйте все функции!** 🚀
-            """
-            
-            await telegram_api.send_message(
-                chat_id=chat_id,
-                text=updates_text,
-                parse_mode='Markdown'
-            )
+            # Все сообщения уходят одним пакетом через одну HTTP-сессию,
+            # в исходном порядке
+            await telegram_api.send_messages([
+                {
+                    'chat_id': chat_id,
+                    'text': f"🧪 **ТЕСТ UI ОБНОВЛЕНИЯ**\n\n{welcome_text}",
+                    'parse_mode': 'Markdown',
+                },
+                {
+                    'chat_id': chat_id,
+                    'text': menu_text,
+                    'reply_markup': t.get_main_menu_keyboard(language),
+                },
+                {
+                    'chat_id': chat_id,
+                    'text': UPDATES_TEXT,
+                    'parse_mode': 'Markdown',
+                },
+            ])
             
             self.stdout.write(
                 self.style.SUCCESS("✅ Тестовые сообщения отправлены успешно!")
             )
-            
+        
         except Exception as e:
             self.stdout.write(
                 self.style.ERROR(f"❌ Ошибка отправки: {e}")
@@ -9,6 +9,18 @@ from django.conf import settings
 
 from apps.bot.telegram.bot_client import TelegramBotClient
 from apps.bot.services.telegram_api_service import TelegramAPIService
+from apps.bot.utils.translations import t
+
+
+# Ключи, которые проверяет test_translations
+TEST_TRANSLATION_KEYS = (
+    'start_welcome',
+    'help_title',
+    'balance_title',
+    'settings_title',
+    'choose_language',
+    'language_set',
+)
 
 
 class Command(BaseCommand):
@@ -75,29 +87,27 @@ class Command(BaseCommand):
         """Показывает информацию о боте"""
         info = bot_client.get_bot_info()
         
-        self.stdout.write(f"\n📊 Информация о боте:")
-        self.stdout.write(f"   Название: {info['name']}")
-        self.stdout.write(f"   Версия: {info['version']}")
+        # Собираем весь блок и выводим его одним write()
+        lines = [
+            "\n📊 Информация о боте:",
+            f"   Название: {info['name']}",
+            f"   Версия: {info['version']}",
+            "\n🚀 Функции:",
+        ]
+        lines.extend(f"   • {feature}" for feature in info['features'])
         
-        self.stdout.write(f"\n🚀 Функции:")
-        for feature in info['features']:
-            self.stdout.write(f"   • {feature}")
+        lines.append("\n🌍 Поддерживаемые языки:")
+        lines.extend(f"   • {lang}" for lang in info['supported_languages'])
         
-        self.stdout.write(f"\n🌍 Поддерживаемые языки:")
-        for lang in info['supported_languages']:
-            self.stdout.write(f"   • {lang}")
+        lines.append("\n💱 Поддерживаемые валюты:")
+        lines.extend(f"   • {curr}" for curr in info['supported_currencies'])
         
-        self.stdout.write(f"\n💱 Поддерживаемые валюты:")
-        for curr in info['supported_currencies']:
-            self.stdout.write(f"   • {curr}")
+        self.stdout.write('\n'.join(lines))
     
     def test_multilingual_functions(self, bot_client, chat_id, language):
         """Тестирует мультиязычные функции"""
         self.stdout.write(f"\n🧪 Тестирование для chat_id: {chat_id}, язык: {language}")
         
-        # Импортируем переводы
-        from apps.bot.utils.translations import t
-        
         # Тестируем получение переводов
         self.test_translations(language)
         
@@ -109,49 +119,36 @@ class Command(BaseCommand):
     
     def test_translations(self, language):
         """Тестирует систему переводов"""
-        from apps.bot.utils.translations import t
+        lines = [f"\n📝 Тестирование переводов для языка '{language}':"]
         
-        self.stdout.write(f"\n📝 Тестирование переводов для языка '{language}':")
-        
-        test_keys = [
-            'start_welcome',
-            'help_title', 
-            'balance_title',
-            'settings_title',
-            'choose_language',
-            'language_set'
-        ]
-        
-        for key in test_keys:
-            text = t.get_text(key, language)
-            self.stdout.write(f"   {key}: {text[:50]}...")
+        # Тексты берутся из кэша переводов (см. BotTranslations._lookup)
+        lines.extend(
+            f"   {key}: {t.get_text(key, language)[:50]}..."
+            for key in TEST_TRANSLATION_KEYS
+        )
         
         # Тестируем форматирование через format
         formatted_text = t.get_text('currency_set', language).format('USD')
-        self.stdout.write(f"   Форматирование: {formatted_text}")
+        lines.append(f"   Форматирование: {formatted_text}")
+        
+        self.stdout.write('\n'.join(lines))
     
     def test_keyboards(self, language):
         """Тестирует клавиатуры"""
-        from apps.bot.utils.translations import t
-        
-        self.stdout.write(f"\n⌨️ Тестирование клавиатур:")
-        
-        # Клавиатура языков
+        # Клавиатуры языков, валют и настроек
         lang_kb = t.get_language_keyboard()
-        self.stdout.write(f"   Язык: {len(lang_kb['inline_keyboard'])} рядов")
-        
-        # Клавиатура валют
         curr_kb = t.get_currency_keyboard(language)
-        self.stdout.write(f"   Валюта: {len(curr_kb['inline_keyboard'])} рядов")
-        
-        # Клавиатура настроек
         settings_kb = t.get_settings_keyboard(language)
-        self.stdout.write(f"   Настройки: {len(settings_kb['inline_keyboard'])} рядов")
+        
+        self.stdout.write('\n'.join([
+            f"\n⌨️ Тестирование клавиатур:",
+            f"   Язык: {len(lang_kb['inline_keyboard'])} рядов",
+            f"   Валюта: {len(curr_kb['inline_keyboard'])} рядов",
+            f"   Настройки: {len(settings_kb['inline_keyboard'])} рядов",
+        ]))
     
     def test_message_sending(self, bot_client, chat_id, language):
         """Тестирует отправку сообщения"""
-        from apps.bot.utils.translations import t
-        
         self.stdout.write(f"\n📤 Отправка тестового сообщения...")
         
         # Создаём тестовое обновление
@@ -169,19 +166,15 @@ class Command(BaseCommand):
         }
         
         try:
-            # Симулируем обработку команды /start
-            bot_client.handle_update(test_update)
+            # Симулируем обработку команды /start и ждём завершения обработчиков
+            bot_client.handle_update(test_update, wait=True)
             
             self.stdout.write(
                 self.style.SUCCESS(
-                    f"✅ Тестовое обновление отправлено в обработку"
+                    f"✅ Тестовое обновление обработано"
                 )
             )
             
-            # Даём время на обработку
-            import time
-            time.sleep(2)
-            
             self.stdout.write(
                 self.style.SUCCESS(
                     "✅ Проверьте ваш Telegram - должно прийти приветственное сообщение!"
@@ -3,7 +3,23 @@
 """
 
 from django.core.management.base import BaseCommand
-from apps.bot.services.text_parser_service import TextParserService
+from apps.bot.services.text_parser_service import text_parser_service
+from apps.bot.utils.command_output import buffered_output
+from apps.bot.utils.event_loop import run_async
+
+# Встроенные тесты: (текст, язык)
+TEST_CASES = (
+    ("потратил 10000 сум на продукты", 'ru'),
+    ("купил молоко за 5000", 'ru'),
+    ("заработал 1000 долларов", 'ru'),
+    ("потратил 50$ на бензин", 'ru'),
+    ("заплатил 200 евро за одежду", 'ru'),
+    ("получил зарплату 2000000 сум", 'ru'),
+    ("spent 100 dollars on groceries", 'en'),
+    ("earned 500$ for work", 'en'),
+    ("5000 so'm mahsulotlarga sarfladim", 'uz'),
+    ("100 dollar ishlab topdim", 'uz'),
+)
 
 
 class Command(BaseCommand):
@@ -24,44 +40,41 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        parser = TextParserService()
+        # Вывод пишется одним блоком в конце команды
+        with buffered_output(self):
+            self._handle(*args, **options)
+    
+    def _handle(self, *args, **options):
+        parser = text_parser_service
+        write = self.stdout.write
+        success, error = self.style.SUCCESS, self.style.ERROR
         
         if options['text']:
             # Тестируем конкретный текст
             text = options['text']
             language = options['language']
             
-            self.stdout.write(f"Тестируем: '{text}' (язык: {language})")
-            result = parser.parse_transaction_text(text, language)
+            write(f"Тестируем: '{text}' (язык: {language})")
+            result = run_async(parser.parse_transaction_text(text, language))
             
             if result:
-                self.stdout.write(self.style.SUCCESS(f"✅ Результат: {result}"))
+                write(success(f"✅ Результат: {result}"))
             else:
-                self.stdout.write(self.style.ERROR("❌ Не удалось распарсить"))
+                write(error("❌ Не удалось распарсить"))
         else:
             # Запускаем встроенные тесты
-            self.stdout.write("🧪 Запускаем тесты парсера...")
+            write("🧪 Запускаем тесты парсера...")
             
-            test_cases = [
-                ("потратил 10000 сум на продукты", 'ru'),
-                ("купил молоко за 5000", 'ru'),
-                ("заработал 1000 долларов", 'ru'),
-                ("потратил 50$ на бензин", 'ru'),
-                ("заплатил 200 евро за одежду", 'ru'),
-                ("получил зарплату 2000000 сум", 'ru'),
-                ("spent 100 dollars on groceries", 'en'),
-                ("earned 500$ for work", 'en'),
-                ("5000 so'm mahsulotlarga sarfladim", 'uz'),
-                ("100 dollar ishlab topdim", 'uz'),
-            ]
+            async def parse_all():
+                return [
+                    await parser.parse_transaction_text(text, lang)
+                    for text, lang in TEST_CASES
+                ]
             
-            for text, lang in test_cases:
-                self.stdout.write(f"\n📝 Тест: '{text}' ({lang})")
-                result = parser.parse_transaction_text(text, lang)
-                
-                if result:
-                    self.stdout.write(self.style.SUCCESS(f"✅ {result}"))
-                else:
-                    self.stdout.write(self.style.ERROR("❌ Не распознано"))
+            lines = []
+            for (text, lang), result in zip(TEST_CASES, run_async(parse_all())):
+                lines.append(f"\n📝 Тест: '{text}' ({lang})")
+                lines.append(success(f"✅ {result}") if result else error("❌ Не распознано"))
             
-            self.stdout.write(self.style.SUCCESS("\n🎉 Тестирование завершено!")) 
\ No newline at end of file
+            lines.append(success("\n🎉 Тестирование завершено!"))
+            write('\n'.join(lines))
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2026-10-15 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='messagelog',
+            index=models.Index(fields=['user', '-created_at'], name='bot_message_user_id_24fca5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voicecommand',
+            index=models.Index(fields=['user', '-created_at'], name='bot_voiceco_user_id_2fc009_idx'),
+        ),
+    ]
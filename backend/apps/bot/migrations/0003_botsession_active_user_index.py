@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2026-10-15 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0002_user_created_at_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='botsession',
+            name='bot_botsess_user_id_ec4568_idx',
+        ),
+        migrations.AddIndex(
+            model_name='botsession',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user'], name='bot_botsess_active_user_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.3 on 2026-10-15 12:00
+
+import apps.bot.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0003_botsession_active_user_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='botsession',
+            name='id',
+            field=models.UUIDField(default=apps.bot.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='messagelog',
+            name='id',
+            field=models.UUIDField(default=apps.bot.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='photoreceipt',
+            name='id',
+            field=models.UUIDField(default=apps.bot.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='voicecommand',
+            name='id',
+            field=models.UUIDField(default=apps.bot.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
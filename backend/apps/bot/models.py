@@ -3,10 +3,26 @@
 """
 
 from django.db import models
+import os
+import time
 import uuid
 from django.utils import timezone
 
 
+def uuid7():
+    """
+    UUID версии 7 (RFC 9562): старшие 48 бит - время в миллисекундах, остальное случайно
+    
+    Новые ключи растут со временем, поэтому вставки в таблицы логов идут
+    в правый край индекса первичного ключа, а не в случайные страницы, как с uuid4.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    # Версия 7 и вариант RFC 4122
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
+
 class BaseModel(models.Model):
     """Базовая модель с общими полями"""
     
@@ -74,8 +90,10 @@ class TelegramUser(BaseModel):
     @property
     def full_name(self):
         """Возвращает полное имя"""
-        parts = [self.first_name, self.last_name]
-        return ' '.join(part for part in parts if part)
+        first_name, last_name = self.first_name, self.last_name
+        if first_name and last_name:
+            return f"{first_name} {last_name}"
+        return first_name or last_name or ''
     
     @property
     def display_name(self):
@@ -86,7 +104,7 @@ class TelegramUser(BaseModel):
 class BotSession(BaseModel):
     """Сессия пользователя в боте"""
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(TelegramUser, on_delete=models.CASCADE, related_name='sessions')
     state = models.CharField(max_length=50, blank=True, null=True, verbose_name='Состояние')
     context_data = models.JSONField(default=dict, blank=True, verbose_name='Контекстные данные')
@@ -98,12 +116,43 @@ class BotSession(BaseModel):
         verbose_name = 'Сессия бота'
         verbose_name_plural = 'Сессии бота'
         indexes = [
-            models.Index(fields=['user', 'is_active']),
+            # Частичный индекс: завершённые сессии в него не попадают
+            models.Index(
+                fields=['user'],
+                condition=models.Q(is_active=True),
+                name='bot_botsess_active_user_idx'
+            ),
             models.Index(fields=['state']),
         ]
     
     def __str__(self):
         return f"Сессия {self.user.display_name} ({self.state or 'default'})"
+    
+    def end_session(self):
+        """Завершает сессию"""
+        self.is_active = False
+        # update() не трогает last_activity (auto_now) - время активности сохраняется
+        type(self).objects.filter(pk=self.pk).update(
+            is_active=False,
+            updated_at=timezone.now()
+        )
+    
+    @classmethod
+    def end_inactive_sessions(cls, hours=24):
+        """
+        Завершает сессии без активности дольше указанного числа часов
+        
+        Returns:
+            Количество завершённых сессий
+        """
+        from datetime import timedelta
+        
+        now = timezone.now()
+        # Один UPDATE; количество строк возвращает сам update(), отдельный COUNT не нужен
+        return cls.objects.filter(
+            is_active=True,
+            last_activity__lt=now - timedelta(hours=hours)
+        ).update(is_active=False, updated_at=now)
 
 
 class MessageLog(BaseModel):
@@ -122,7 +171,7 @@ class MessageLog(BaseModel):
         ('outgoing', 'Исходящее'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(TelegramUser, on_delete=models.CASCADE, related_name='message_logs')
     message_type = models.CharField(max_length=10, choices=MESSAGE_TYPE_CHOICES, verbose_name='Тип сообщения')
     direction = models.CharField(max_length=10, choices=DIRECTION_CHOICES, verbose_name='Направление')
@@ -139,6 +188,7 @@ class MessageLog(BaseModel):
         indexes = [
             models.Index(fields=['user', 'message_type']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['user', '-created_at']),
         ]
     
     def __str__(self):
@@ -161,7 +211,7 @@ class VoiceCommand(BaseModel):
         ('failed', 'Ошибка'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(TelegramUser, on_delete=models.CASCADE, related_name='voice_commands')
     telegram_file_id = models.CharField(max_length=255, verbose_name='Telegram File ID')
     transcription = models.TextField(blank=True, verbose_name='Распознанный текст')
@@ -204,10 +254,15 @@ class VoiceCommand(BaseModel):
         indexes = [
             models.Index(fields=['user', 'status']),
             models.Index(fields=['command_type']),
+            # Выборки "команды пользователя за период" (get_user_stats)
+            models.Index(fields=['user', '-created_at']),
         ]
     
     def __str__(self):
-        return f"Голосовая команда {self.user.display_name}: {self.transcription[:50]}..."
+        transcription = self.transcription
+        if len(transcription) > 50:
+            transcription = f"{transcription[:50]}..."
+        return f"Голосовая команда {self.user.display_name}: {transcription}"
     
     @classmethod
     def get_user_stats(cls, user, days=30):
@@ -216,11 +271,17 @@ class VoiceCommand(BaseModel):
         from datetime import timedelta
         
         start_date = timezone.now() - timedelta(days=days)
-        commands = cls.objects.filter(user=user, created_at__gte=start_date)
         
-        total_commands = commands.count()
-        successful_commands = commands.filter(status='success').count()
-        failed_commands = commands.filter(status='failed').count()
+        # Все счётчики одним запросом (COUNT ... FILTER) вместо трёх отдельных
+        stats = cls.objects.filter(user=user, created_at__gte=start_date).aggregate(
+            total=models.Count('id'),
+            successful=models.Count('id', filter=models.Q(status='success')),
+            failed=models.Count('id', filter=models.Q(status='failed')),
+        )
+        
+        total_commands = stats['total']
+        successful_commands = stats['successful']
+        failed_commands = stats['failed']
         
         return {
             'total_commands': total_commands,
@@ -240,7 +301,7 @@ class PhotoReceipt(BaseModel):
         ('failed', 'Ошибка'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(TelegramUser, on_delete=models.CASCADE, related_name='photo_receipts')
     telegram_file_id = models.CharField(max_length=255, verbose_name='Telegram File ID')
     file_size_bytes = models.PositiveIntegerField(verbose_name='Размер файла (байт)')
@@ -1,3 +1,3 @@
-from .bot_serializer import VoiceCommandLogSerializer, BotSessionSerializer
+from .bot_serializer import VoiceCommandLogSerializer, BotSessionSerializer, BotSessionStatusSerializer
 
-__all__ = ['VoiceCommandLogSerializer', 'BotSessionSerializer']
+__all__ = ['VoiceCommandLogSerializer', 'BotSessionSerializer', 'BotSessionStatusSerializer']
@@ -2,7 +2,36 @@ from rest_framework import serializers
 from apps.bot.models import VoiceCommand, BotSession
 
 
-class VoiceCommandLogSerializer(serializers.ModelSerializer):
+class UserPhoneEagerLoadingMixin:
+    """
+    Загрузка данных для сериализаторов с полем user_phone одним запросом:
+    пользователь через JOIN, и только те колонки, которые попадают в ответ
+    """
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        # Объявленные поля (user_phone и т.п.) не колонки модели - их пропускаем
+        columns = [name for name in cls.Meta.fields if name not in cls._declared_fields]
+        return queryset.select_related('user').only(*columns, 'user__phone_number')
+
+
+class VoiceCommandLogListSerializer(serializers.ListSerializer):
+    """
+    Создание нескольких голосовых команд одним INSERT на пачку (many=True)
+    
+    bulk_create не вызывает save() и сигналы модели; created_at/updated_at
+    и id (uuid7) заполняются как обычно.
+    """
+    
+    BATCH_SIZE = 500
+    
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        objects = [model(**attrs) for attrs in validated_data]
+        return model.objects.bulk_create(objects, batch_size=self.BATCH_SIZE)
+
+
+class VoiceCommandLogSerializer(UserPhoneEagerLoadingMixin, serializers.ModelSerializer):
     user_phone = serializers.CharField(source='user.phone_number', read_only=True)
     
     class Meta:
@@ -16,6 +45,7 @@ class VoiceCommandLogSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'id', 'user_phone', 'created_at', 'updated_at'
         ]
+        list_serializer_class = VoiceCommandLogListSerializer
     
     def validate_transcription(self, value):
         if value and len(value.strip()) < 1:
@@ -23,7 +53,7 @@ class VoiceCommandLogSerializer(serializers.ModelSerializer):
         return value.strip() if value else value
 
 
-class BotSessionSerializer(serializers.ModelSerializer):
+class BotSessionSerializer(UserPhoneEagerLoadingMixin, serializers.ModelSerializer):
     user_phone = serializers.CharField(source='user.phone_number', read_only=True)
     duration_minutes = serializers.FloatField(read_only=True)
     
@@ -35,4 +65,12 @@ class BotSessionSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = [
             'id', 'user_phone', 'created_at', 'updated_at'
-        ] 
\ No newline at end of file
+        ]
+
+
+class BotSessionStatusSerializer(serializers.Serializer):
+    """Краткий статус сессии (без context_data) - для выборок через values()"""
+    
+    is_active = serializers.BooleanField()
+    last_activity = serializers.DateTimeField()
+    state = serializers.CharField(allow_null=True)
@@ -4,20 +4,94 @@
 
 import logging
 import asyncio
+import json
+import time
+import weakref
 import aiohttp
-from typing import Dict, Any, Optional
+from typing import BinaryIO, Dict, Any, List, Optional, Tuple
 from django.conf import settings
 
+try:
+    import orjson
+except ImportError:  # orjson необязателен - без него используется стандартный json
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+if orjson is not None:
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+    
+    _json_loads = orjson.loads
+else:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# Ссылка на файл из getFile действительна не меньше часа - кэшируем с запасом
+FILE_INFO_CACHE_TTL = 55 * 60
+FILE_INFO_CACHE_MAXSIZE = 2048
+
+# Таймауты создаются один раз, а не на каждый запрос
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=60, sock_read=30)
+
+# Размер блока при потоковом скачивании файлов
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 class TelegramAPIService:
     """Сервис для работы с Telegram Bot API"""
     
+    # file_id -> (информация о файле, время истечения); общий для всех экземпляров
+    _file_info_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+    
+    # Общие HTTP-сессии по event loop'ам. Сессия aiohttp привязана к циклу, а каждое
+    # обновление бот обрабатывает в своём потоке со своим циклом, поэтому одна сессия
+    # на весь процесс невозможна. Зато все запросы одного обновления (getFile,
+    # скачивание, ответы) идут через один пул keep-alive соединений
+    _loop_sessions: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]' = (
+        weakref.WeakKeyDictionary()
+    )
+    
     def __init__(self):
         self.token = getattr(settings, 'TELEGRAM_BOT_TOKEN', '')
         self.base_url = f"https://api.telegram.org/bot{self.token}"
         self.file_url = f"https://api.telegram.org/file/bot{self.token}"
+        # Общая сессия внутри `async with TelegramAPIService() as api:`
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def __aenter__(self) -> 'TelegramAPIService':
+        """Открывает одну HTTP-сессию на все запросы внутри блока"""
+        self._session = aiohttp.ClientSession(timeout=REQUEST_TIMEOUT, json_serialize=_json_dumps)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        session, self._session = self._session, None
+        if session is not None:
+            await session.close()
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Сессия блока `async with`, иначе общая сессия текущего event loop"""
+        if self._session is not None:
+            return self._session
+        
+        loop = asyncio.get_running_loop()
+        session = self._loop_sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=75),
+                timeout=REQUEST_TIMEOUT,
+                json_serialize=_json_dumps
+            )
+            self._loop_sessions[loop] = session
+        return session
+    
+    @classmethod
+    async def close_session(cls) -> None:
+        """Закрывает общую сессию текущего event loop (вызывать до завершения цикла)"""
+        session = cls._loop_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
     
     async def send_message(
         self, 
@@ -39,6 +113,37 @@ class TelegramAPIService:
         
         return await self._make_request('POST', url, data)
     
+    async def send_messages(
+        self, 
+        messages: List[Dict[str, Any]], 
+        ordered: bool = True,
+        concurrency: int = 20
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Отправка нескольких сообщений через одну HTTP-сессию
+        
+        Используется сессия блока `async with`, если он открыт, иначе общая
+        сессия текущего event loop (см. _get_session)
+        
+        Args:
+            messages: Аргументы send_message для каждого сообщения
+            ordered: Сохранять порядок сообщений в чате. Если False, запросы
+                выполняются параллельно и Telegram может доставить их в любом порядке
+            concurrency: Сколько запросов держать в полёте одновременно (при ordered=False),
+                чтобы пачка сообщений не упиралась в лимиты Telegram
+        """
+        if ordered:
+            return [await self.send_message(**message) for message in messages]
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def send(message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.send_message(**message)
+        
+        # Ошибки отдельных запросов send_message уже превращает в None
+        return list(await asyncio.gather(*(send(message) for message in messages)))
+    
     async def edit_message_text(
         self, 
         chat_id: int, 
@@ -61,6 +166,31 @@ class TelegramAPIService:
         
         return await self._make_request('POST', url, data)
     
+    async def send_or_edit_message(
+        self, 
+        chat_id: int, 
+        text: str, 
+        message_id: Optional[int] = None,
+        reply_markup: Optional[Dict[str, Any]] = None,
+        parse_mode: str = 'HTML'
+    ) -> Optional[Dict[str, Any]]:
+        """Редактирует сообщение message_id, а если его нет - отправляет новое"""
+        if message_id:
+            return await self.edit_message_text(
+                chat_id=chat_id,
+                message_id=message_id,
+                text=text,
+                reply_markup=reply_markup,
+                parse_mode=parse_mode
+            )
+        
+        return await self.send_message(
+            chat_id=chat_id,
+            text=text,
+            reply_markup=reply_markup,
+            parse_mode=parse_mode
+        )
+    
     async def delete_message(
         self, 
         chat_id: int, 
@@ -76,26 +206,82 @@ class TelegramAPIService:
         return await self._make_request('POST', url, data)
     
     async def get_file(self, file_id: str) -> Optional[Dict[str, Any]]:
-        """Получение информации о файле"""
+        """Получение информации о файле (с кэшированием file_path)"""
+        now = time.monotonic()
+        cached = self._file_info_cache.pop(file_id, None)
+        if cached and cached[1] > now:
+            # Возвращаем запись в конец - при переполнении вытесняются давно не использованные
+            self._file_info_cache[file_id] = cached
+            return cached[0]
+        
         url = f"{self.base_url}/getFile"
         data = {'file_id': file_id}
         
-        return await self._make_request('POST', url, data)
+        result = await self._make_request('POST', url, data)
+        if result and result.get('file_path'):
+            self._cache_file_info(file_id, result, now)
+        
+        return result
+    
+    @classmethod
+    def _cache_file_info(cls, file_id: str, file_info: Dict[str, Any], now: float) -> None:
+        """Сохраняет информацию о файле в кэш, вытесняя устаревшие записи"""
+        cache = cls._file_info_cache
+        
+        if len(cache) >= FILE_INFO_CACHE_MAXSIZE:
+            try:
+                for key in [key for key, (_, expires_at) in cache.items() if expires_at <= now]:
+                    cache.pop(key, None)
+                
+                if len(cache) >= FILE_INFO_CACHE_MAXSIZE:
+                    # Удаляем давно не использованную запись (dict сохраняет порядок вставки)
+                    cache.pop(next(iter(cache)), None)
+            except (StopIteration, RuntimeError):
+                # Кэш одновременно меняется из другого потока - пропускаем вытеснение
+                pass
+        
+        cache[file_id] = (file_info, now + FILE_INFO_CACHE_TTL)
     
     async def download_file(self, file_path: str) -> Optional[bytes]:
         """Скачивание файла"""
         url = f"{self.file_url}/{file_path}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.read()
-                    return None
+            return await self._download(self._get_session(), url)
         except Exception as e:
             logger.error(f"Error downloading file {file_path}: {e}")
             return None
     
+    @staticmethod
+    async def _download(session: aiohttp.ClientSession, url: str) -> Optional[bytes]:
+        async with session.get(url, timeout=DOWNLOAD_TIMEOUT) as response:
+            if response.status == 200:
+                return await response.read()
+            return None
+    
+    async def download_file_to(self, file_path: str, dest: BinaryIO) -> bool:
+        """
+        Потоковое скачивание файла в dest (файл на диске, BytesIO и т.п.)
+        
+        В памяти держится только один блок, а не весь файл, как в download_file.
+        
+        Returns:
+            True, если файл скачан целиком
+        """
+        url = f"{self.file_url}/{file_path}"
+        
+        try:
+            async with self._get_session().get(url, timeout=DOWNLOAD_TIMEOUT) as response:
+                if response.status != 200:
+                    return False
+                
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    dest.write(chunk)
+                return True
+        except Exception as e:
+            logger.error(f"Error downloading file {file_path}: {e}")
+            return False
+    
     async def answer_callback_query(
         self, 
         callback_query_id: str, 
@@ -135,20 +321,28 @@ class TelegramAPIService:
     ) -> Optional[Dict[str, Any]]:
         """Выполнение HTTP запроса к Telegram API"""
         try:
-            async with aiohttp.ClientSession() as session:
-                if method.upper() == 'GET':
-                    async with session.get(url, params=data) as response:
-                        result = await response.json()
-                else:
-                    async with session.post(url, json=data) as response:
-                        result = await response.json()
-                
-                if result.get('ok'):
-                    return result.get('result')
-                else:
-                    logger.error(f"Telegram API error: {result}")
-                    return None
+            result = await self._request(self._get_session(), method, url, data)
+            
+            if result.get('ok'):
+                return result.get('result')
+            else:
+                logger.error(f"Telegram API error: {result}")
+                return None
                 
         except Exception as e:
             logger.error(f"Error making request to {url}: {e}")
-            return None 
\ No newline at end of file
+            return None
+    
+    @staticmethod
+    async def _request(
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        if method.upper() == 'GET':
+            async with session.get(url, params=data) as response:
+                return _json_loads(await response.read())
+        
+        async with session.post(url, json=data) as response:
+            return _json_loads(await response.read()) 
\ No newline at end of file
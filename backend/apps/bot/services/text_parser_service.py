@@ -4,261 +4,525 @@
 """
 
 import re
+import sys
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 from decimal import Decimal, InvalidOperation
 
 logger = logging.getLogger(__name__)
 
+# Статические регулярные выражения компилируются один раз при импорте модуля
+DIGITS_RE = re.compile(r'\d+')
+# Разделитель внутри числа обязателен: с [\s,]* цифры можно было делить между
+# повторениями группы экспоненциальным числом способов, и строка вида
+# "11111111111111111111111a" (нет границы слова) зависала на секунды
+STANDALONE_NUMBER_RE = re.compile(r'\b\d+(?:[\s,]+\d+)*(?:\.\d+)?\b')
+
+# Служебные слова, которые убираются из названий в командах управления
+CATEGORY_NAME_STOPWORDS_RE = re.compile(r'\b(?:для|with|uchun)\b')
+DELETE_TARGET_STOPWORDS_RE = re.compile(r'\b(?:для|with|uchun|под|номер|number|raqam)\b')
+
+# Поиск просто чисел: 10000, 15.99. Совпадения этого выражения покрывают все цифры
+# текста, поэтому варианты с разделителями тысяч ("10 000", "1,000") ничего не
+# добавляли - до них доходило, только если все цифры в тексте нули
+NUMBER_RE = re.compile(r'\d+(?:\.\d{1,2})?')
+
+# Паттерны для чисел словами с валютой
+NUMBER_WORD_PATTERNS = tuple(
+    re.compile(pattern)
+    for pattern in (
+        # "одна тысяча долларов", "тысяча долларов"
+        r'(?:одн[ауо]?\s+)?тысяч[ауи]?\s+(?:доллар|сум|рубл|евро)',
+        # "две тысячи долларов", "пять тысяч сум"
+        r'(?:дв[ае]|три|четыре|пять|шесть|семь|восемь|девять|десять)\s+тысяч[иь]?\s+(?:доллар|сум|рубл|евро)',
+        # просто "тысяча долларов"
+        r'тысяч[ауи]?\s+(?:доллар|сум|рубл|евро)',
+        # "сто долларов", "двести сум" и т.д.
+        r'(?:сто|двести|триста|четыреста|пятьсот|шестьсот|семьсот|восемьсот|девятьсот)\s+(?:доллар|сум|рубл|евро)',
+        # "пятьдесят долларов" и т.д.
+        r'(?:десять|двадцать|тридцать|сорок|пятьдесят|шестьдесят|семьдесят|восемьдесят|девяносто)\s+(?:доллар|сум|рубл|евро)'
+    )
+)
+
+# Каждый паттерн выше заканчивается одним из этих слов: без них (в том числе во всех
+# текстах без кириллицы) искать числа словами бессмысленно
+NUMBER_WORD_CURRENCY_RE = re.compile(r'доллар|сум|рубл|евро')
+
+def _compile_code_alternations(table: Sequence[Tuple[str, Sequence[str]]]) -> Tuple[Tuple[str, 're.Pattern[str]'], ...]:
+    """(код, слова) -> (код, одно выражение на все слова кода); порядок кодов сохраняется"""
+    return tuple(
+        (code, re.compile('|'.join(re.escape(word) for word in words)))
+        for code, words in table
+    )
+
+
+# Валюта суммы, записанной словами (в порядке приоритета)
+WORDS_CURRENCY_REGEXES = _compile_code_alternations((
+    ('USD', ('доллар', 'долларов', 'dollaro', 'usd', '$')),
+    ('EUR', ('евро', 'eur', '€')),
+    ('RUB', ('рубл', 'руб', 'rub', '₽')),
+    ('UZS', ('сум', 'сом', 'uzs', 'so\'m')),
+))
+
+# Целевой язык и валюта в командах управления (в порядке приоритета)
+TARGET_LANGUAGE_REGEXES = _compile_code_alternations((
+    ('ru', ('русский', 'russian', 'ru')),
+    ('en', ('английский', 'english', 'en')),
+    ('uz', ('узбекский', 'uzbek', 'uz', 'o\'zbek')),
+))
+TARGET_CURRENCY_REGEXES = _compile_code_alternations((
+    ('USD', ('доллар', 'dollar', 'usd', '$')),
+    ('EUR', ('евро', 'euro', 'eur', '€')),
+    ('RUB', ('рубль', 'ruble', 'rub', '₽')),
+    ('UZS', ('сум', 'som', 'uzs')),
+))
+
+# Числа словами -> значение. Ключи интернированы: токены из text.split()
+# сравниваются с ними в горячем цикле _parse_number_words
+NUMBER_WORDS_RU = {
+    sys.intern(word): value
+    for word, value in {
+        'один': 1, 'одна': 1, 'одну': 1, 'одной': 1,
+        'два': 2, 'две': 2, 'двух': 2,
+        'три': 3, 'трех': 3, 'трём': 3,
+        'четыре': 4, 'четырех': 4, 'четырём': 4,
+        'пять': 5, 'пяти': 5, 'пятью': 5,
+        'шесть': 6, 'шести': 6, 'шестью': 6,
+        'семь': 7, 'семи': 7, 'семью': 7,
+        'восемь': 8, 'восьми': 8, 'восемью': 8,
+        'девять': 9, 'девяти': 9, 'девятью': 9,
+        'десять': 10, 'десяти': 10, 'десятью': 10,
+        'одиннадцать': 11, 'одиннадцати': 11,
+        'двенадцать': 12, 'двенадцати': 12,
+        'тринадцать': 13, 'тринадцати': 13,
+        'четырнадцать': 14, 'четырнадцати': 14,
+        'пятнадцать': 15, 'пятнадцати': 15,
+        'шестнадцать': 16, 'шестнадцати': 16,
+        'семнадцать': 17, 'семнадцати': 17,
+        'восемнадцать': 18, 'восемнадцати': 18,
+        'девятнадцать': 19, 'девятнадцати': 19,
+        'двадцать': 20, 'двадцати': 20, 'двадцатью': 20,
+        'тридцать': 30, 'тридцати': 30, 'тридцатью': 30,
+        'сорок': 40, 'сорока': 40,
+        'пятьдесят': 50, 'пятидесяти': 50, 'пятьюдесятью': 50,
+        'шестьдесят': 60, 'шестидесяти': 60,
+        'семьдесят': 70, 'семидесяти': 70,
+        'восемьдесят': 80, 'восьмидесяти': 80,
+        'девяносто': 90, 'девяноста': 90,
+        'сто': 100, 'ста': 100, 'сотню': 100,
+        'двести': 200, 'двухсот': 200,
+        'триста': 300, 'трехсот': 300,
+        'четыреста': 400, 'четырехсот': 400,
+        'пятьсот': 500, 'пятисот': 500,
+        'шестьсот': 600, 'шестисот': 600,
+        'семьсот': 700, 'семисот': 700,
+        'восемьсот': 800, 'восьмисот': 800,
+        'девятьсот': 900, 'девятисот': 900,
+        'тысяча': 1000, 'тысячи': 1000, 'тысяч': 1000, 'тысячу': 1000,
+        'миллион': 1000000, 'миллиона': 1000000, 'миллионов': 1000000,
+        'миллиард': 1000000000, 'миллиарда': 1000000000, 'миллиардов': 1000000000
+    }.items()
+}
+
+# Множители разрядов: "две тысячи", "три миллиона"
+NUMBER_SCALES = frozenset({1000, 1000000, 1000000000})
+
+# Валютные слова, которые _parse_number_words пропускает
+NUMBER_CURRENCY_WORDS = frozenset({'доллар', 'долларов', 'сум', 'сом', 'рубл', 'рублей', 'евро'})
+
+# Описание и категория по умолчанию, если в тексте их не нашлось
+DEFAULT_DESCRIPTIONS = {
+    'ru': 'покупка',
+    'en': 'purchase',
+    'uz': 'xarid'
+}
+DEFAULT_CATEGORIES = {
+    'ru': 'прочее',
+    'en': 'other',
+    'uz': 'boshqa'
+}
+
+# Улучшенные паттерны для валют. (?<!\d) не даёт начинать совпадение с середины
+# числа: результат тот же (подходящее совпадение всегда есть и с начала числа),
+# но длинная строка цифр без валюты больше не просматривается за квадратичное время
+CURRENCY_PATTERNS = {
+    'UZS': [
+        r'(?<!\d)(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*сум(?:ов|а|ов)?',
+        r'(?<!\d)(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*uzs',
+        r'(?<!\d)(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*so\'m',
+        r'(?<!\d)(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*сўм',
+        r'(?<!\d)(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*som',
+    ],
+    'USD': [
+        r'(?<!\d)(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*(?:\$|доллар(?:ов|а)?|usd|dollar)',
+        r'\$\s*(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)',
+        r'(?<!\d)(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*бакс',
+    ],
+    'EUR': [
+        r'(?<!\d)(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*(?:евро|eur|€)',
+        r'€\s*(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)',
+    ],
+    'RUB': [
+        r'(?<!\d)(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*(?:рубл(?:ей|я|ь)|руб|rub)',
+        r'(?<!\d)(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*₽',
+    ]
+}
+
+# Обозначения валют: каждый паттерн валюты содержит одно из них, поэтому
+# если обозначения в тексте нет, паттерны этой валюты можно не запускать
+CURRENCY_MARKER_REGEXES = {
+    'UZS': re.compile(r"сум|uzs|so'm|сўм|som", re.IGNORECASE),
+    'USD': re.compile(r'\$|доллар|usd|dollar|бакс', re.IGNORECASE),
+    'EUR': re.compile(r'евро|eur|€', re.IGNORECASE),
+    'RUB': re.compile(r'руб|rub|₽', re.IGNORECASE),
+}
+
+# Ключевые слова для типов транзакций
+EXPENSE_KEYWORDS = {
+    'ru': ['потратил', 'купил', 'заплатил', 'потрачено', 'расход', 'трата', 'оплатил', 'заплачено', 'взял', 'приобрел', 'истратил', 'потрати'],
+    'en': ['spent', 'bought', 'paid', 'expense', 'cost', 'purchase', 'got', 'acquired', 'buy'],
+    'uz': ['sarfladim', 'sotib oldim', 'to\'ladim', 'xarajat', 'pul sarflandi', 'sotib oldi']
+}
+
+# Команды управления настройками + КОМАНДЫ УДАЛЕНИЯ
+MANAGEMENT_KEYWORDS = {
+    'ru': {
+        'language': ['поменяй язык', 'смени язык', 'установи язык', 'язык на', 'переключи язык'],
+        'currency': ['смени валюту', 'поменяй валюту', 'установи валюту', 'валюта на', 'сделай валютой'],
+        'create_category': ['создай категорию', 'добавь категорию', 'новая категория'],
+        'delete_category': ['удали категорию', 'удалить категорию', 'убери категорию', 'стереть категорию'],
+        'delete_transaction': ['удали транзакцию', 'удалить транзакцию', 'отмени операцию', 'убери операцию']
+    },
+    'en': {
+        'language': ['change language', 'set language', 'switch language', 'language to'],
+        'currency': ['change currency', 'set currency', 'switch currency', 'currency to'],
+        'create_category': ['create category', 'add category', 'new category'],
+        'delete_category': ['delete category', 'remove category', 'erase category'],
+        'delete_transaction': ['delete transaction', 'remove transaction', 'cancel operation']
+    },
+    'uz': {
+        'language': ['tilni o\'zgartir', 'til o\'rnat', 'tilni almashtir'],
+        'currency': ['valyutani o\'zgartir', 'valyuta o\'rnat', 'valyutani almashtir'],
+        'create_category': ['kategoriya yarat', 'kategoriya qo\'sh', 'yangi kategoriya'],
+        'delete_category': ['kategoriyani o\'chir', 'kategoriya o\'chir', 'kategoriyani olib tashla'],
+        'delete_transaction': ['operatsiyani o\'chir', 'tranzaksiyani o\'chir', 'operatsiya bekor qil']
+    }
+}
+
+# Языки парсера (в этом порядке ищутся команды управления)
+SUPPORTED_LANGUAGES = ('ru', 'en', 'uz')
+
+# Порядок проверки команд управления (при нескольких фразах в тексте побеждает первая)
+MANAGEMENT_COMMAND_ORDER = ('language', 'currency', 'delete_category', 'delete_transaction', 'create_category')
+
+# Ключевые слова доходов
+INCOME_KEYWORDS = {
+    'ru': ['заработал', 'получил', 'доход', 'зарплата', 'прибыль', 'заработано', 'поступило'],
+    'en': ['earned', 'received', 'income', 'salary', 'profit', 'got'],
+    'uz': ['ishlab topdim', 'oldim', 'daromad', 'maosh', 'foyda']
+}
+
+# Предлоги и служебные слова, которые убираются из описания
+PREPOSITIONS = {
+    'ru': ['на', 'за', 'в', 'с', 'для', 'по', 'из', 'к', 'у', 'о', 'от', 'до', 'при', 'под'],
+    'en': ['on', 'for', 'in', 'with', 'to', 'from', 'at', 'by', 'of', 'the', 'a', 'an'],
+    'uz': ['uchun', 'bilan', 'dan', 'ga', 'da', 'ning', 'ni', 'va', 'yoki']
+}
+
+# ЗНАЧИТЕЛЬНО РАСШИРЕННЫЕ автоматические категории с огромным количеством товаров
+AUTO_CATEGORIES = {
+    'ru': {
+        'еда': [
+            # Молочные продукты
+            'молоко', 'кефир', 'ряженка', 'йогурт', 'творог', 'сметана', 'масло сливочное', 'сыр', 'брынза', 'кисломолочные',
+            
+            # Хлебобулочные
+            'хлеб', 'батон', 'багет', 'лаваш', 'сдоба', 'булочки', 'печенье', 'торт', 'пирожки', 'кекс',
+            
+            # Мясо и рыба
+            'мясо', 'говядина', 'свинина', 'баранина', 'курица', 'индейка', 'колбаса', 'сосиски', 'ветчина', 'рыба', 'семга', 'окунь', 'треска',
+            
+            # Овощи и фрукты
+            'овощи', 'фрукты', 'яблоки', 'бананы', 'апельсины', 'мандарины', 'груши', 'виноград', 'картошка', 'лук', 'морковь', 'капуста', 'помидоры', 'огурцы', 'перец', 'свекла',
+            
+            # Крупы и макароны
+            'рис', 'гречка', 'овсянка', 'манка', 'макароны', 'спагетти', 'лапша', 'пшено', 'перловка',
+            
+            # Консервы и заморозка
+            'консервы', 'тушенка', 'компот', 'варенье', 'мороженое', 'замороженные овощи', 'пельмени', 'вареники',
+            
+            # Приправы и соусы
+            'соль', 'сахар', 'мука', 'масло растительное', 'уксус', 'приправы', 'кетчуп', 'майонез', 'горчица',
+            
+            # Напитки
+            'вода', 'сок', 'лимонад', 'чай', 'кофе', 'пиво', 'вино', 'коньяк', 'водка',
+            
+            # Общие
+            'продукты', 'еда', 'пища', 'супермаркет', 'магазин продуктов', 'продуктовый', 'гастроном', 'ресторан', 'кафе', 'столовая', 'обед', 'ужин', 'завтрак'
+        ],
+        
+        'транспорт': [
+            'бензин', 'топливо', 'дизель', 'газ пропан', 'автобус', 'метро', 'машина', 'авто', 'автомобиль', 'проезд', 'парковка', 'гараж', 'мойка', 'шиномонтаж', 'техосмотр', 'страховка авто', 'запчасти'
+        ],
+        
+        'такси': [
+            'такси', 'uber', 'yandex такси', 'яндекс такси', 'bolt', 'поездка', 'машина такси', 'трансфер'
+        ],
+        
+        'коммунальные': [
+            'свет', 'электричество', 'газ', 'вода', 'интернет', 'телефон', 'коммуналка', 'коммунальные', 'отопление', 'канализация', 'домофон', 'кабельное тв', 'мобильная связь'
+        ],
+        
+        'одежда': [
+            # Верхняя одежда
+            'одежда', 'куртка', 'пальто', 'шуба', 'плащ', 'ветровка', 'пуховик',
+            
+            # Обувь
+            'обувь', 'ботинки', 'сапоги', 'туфли', 'кроссовки', 'тапочки', 'сандалии', 'босоножки',
+            
+            # Повседневная одежда
+            'джинсы', 'брюки', 'штаны', 'юбка', 'платье', 'рубашка', 'блузка', 'футболка', 'свитер', 'кофта', 'пиджак', 'костюм',
+            
+            # Нижнее белье и аксессуары
+            'белье', 'носки', 'колготки', 'трусы', 'бюстгальтер', 'шапка', 'шарф', 'перчатки', 'ремень', 'сумка', 'рюкзак',
+            
+            # Места покупок
+            'магазин одежды', 'бутик', 'секонд-хенд'
+        ],
+        
+        'развлечения': [
+            'кино', 'театр', 'игры', 'книги', 'музыка', 'концерт', 'клуб', 'дискотека', 'боулинг', 'бильярд', 'караоке', 'парк развлечений', 'аттракционы', 'цирк', 'музей', 'выставка'
+        ],
+        
+        'здоровье': [
+            'лекарства', 'врач', 'больница', 'аптека', 'медицина', 'поликлиника', 'стоматолог', 'анализы', 'узи', 'рентген', 'прививка', 'операция', 'массаж', 'физиотерапия'
+        ],
+        
+        'работа': [
+            'зарплата', 'премия', 'работа', 'подработка', 'бонус', 'аванс', 'доплата', 'надбавка'
+        ],
+        
+        'вредные привычки': [
+            'сигареты', 'курение', 'табак', 'сигары', 'кальян', 'алкоголь', 'пиво', 'вино', 'водка', 'коньяк', 'виски', 'шампанское', 'самогон'
+        ],
+        
+        'красота': [
+            'парикмахер', 'маникюр', 'педикюр', 'салон красоты', 'косметика', 'крем', 'шампунь', 'мыло', 'духи', 'помада', 'тушь', 'стрижка', 'окрашивание', 'укладка'
+        ],
+        
+        'образование': [
+            'курсы', 'книги', 'обучение', 'университет', 'школа', 'репетитор', 'семинар', 'тренинг', 'мастер-класс', 'учебники', 'канцелярия', 'тетради', 'ручки'
+        ],
+        
+        'дом': [
+            # Мебель
+            'мебель', 'диван', 'кровать', 'стол', 'стул', 'шкаф', 'комод', 'полка',
+            
+            # Бытовая техника
+            'холодильник', 'стиральная машина', 'микроволновка', 'телевизор', 'пылесос', 'утюг', 'чайник', 'мультиварка',
+            
+            # Ремонт и строительство
+            'ремонт', 'краска', 'обои', 'плитка', 'линолеум', 'ламинат', 'гвозди', 'шурупы', 'инструменты', 'строительство', 'декор', 'посуда', 'кастрюли', 'сковородки'
+        ],
+        
+        'спорт': [
+            'спортзал', 'фитнес', 'тренажерный зал', 'бассейн', 'йога', 'танцы', 'спортивная одежда', 'кроссовки для спорта', 'абонемент'
+        ],
+        
+        'хобби': [
+            'рукоделие', 'вязание', 'шитье', 'вышивание', 'рисование', 'краски', 'кисти', 'холст', 'пазлы', 'конструктор'
+        ],
+        
+        'подарки': [
+            'подарок', 'сувенир', 'цветы', 'букет', 'торт на день рождения', 'открытка', 'игрушка'
+        ],
+        
+        'животные': [
+            'корм для животных', 'ветеринар', 'зоомагазин', 'игрушки для животных', 'ошейник', 'поводок'
+        ]
+    },
+    
+    'en': {
+        'food': [
+            'groceries', 'milk', 'bread', 'meat', 'vegetables', 'fruits', 'food', 'restaurant', 'cafe', 'apples', 'bananas', 'chicken', 'beef', 'cheese', 'yogurt', 'butter', 'eggs', 'rice', 'pasta', 'fish', 'supermarket', 'grocery store'
+        ],
+        'transport': ['gas', 'fuel', 'bus', 'metro', 'taxi', 'car', 'auto', 'parking', 'garage'],
+        'utilities': ['electricity', 'gas', 'water', 'internet', 'phone', 'heating'],
+        'clothing': ['clothes', 'shoes', 'jacket', 'jeans', 'dress', 'shirt', 'boots', 'sneakers'],
+        'entertainment': ['cinema', 'movies', 'games', 'books', 'music', 'concert', 'club'],
+        'health': ['medicine', 'doctor', 'hospital', 'pharmacy', 'dentist'],
+        'work': ['salary', 'bonus', 'work', 'job', 'wage'],
+        'home': ['furniture', 'repair', 'tools', 'construction', 'decoration']
+    },
+    
+    'uz': {
+        'oziq-ovqat': [
+            'mahsulotlar', 'sut', 'non', 'go\'sht', 'sabzavot', 'meva', 'ovqat', 'restoran', 'olma', 'banan', 'tovuq', 'mol go\'shti', 'pishloq', 'yogurt', 'sariyog', 'tuxum', 'guruch', 'makaron', 'baliq'
+        ],
+        'transport': ['benzin', 'yoqilg\'i', 'avtobus', 'metro', 'taksi', 'mashina'],
+        'kommunal': ['elektr', 'gaz', 'suv', 'internet', 'telefon'],
+        'kiyim': ['kiyim', 'oyoq kiyim', 'kurtka', 'jinsi', 'ko\'ylak'],
+        'o\'yin-kulgi': ['kino', 'teatr', 'o\'yinlar', 'kitoblar', 'musiqa'],
+        'salomatlik': ['dori', 'shifokor', 'kasalxona', 'dorixona'],
+        'ish': ['maosh', 'mukofot', 'ish', 'ishlab topish']
+    }
+}
+
+# Базовые курсы (в реальном проекте должны получаться из API). Decimal строится
+# один раз при импорте из того же str(float), что раньше на каждую конвертацию
+EXCHANGE_RATES = {
+    tuple(rate_key.split('_')): Decimal(str(rate))
+    for rate_key, rate in {
+        'USD_UZS': 12300,
+        'EUR_UZS': 13400,
+        'RUB_UZS': 135,
+        'UZS_USD': 1 / 12300,
+        'UZS_EUR': 1 / 13400,
+        'UZS_RUB': 1 / 135,
+        'USD_EUR': 0.92,
+        'EUR_USD': 1.09,
+        'USD_RUB': 91,
+        'RUB_USD': 1 / 91,
+        'EUR_RUB': 99,
+        'RUB_EUR': 1 / 99
+    }.items()
+}
+DEFAULT_EXCHANGE_RATE = Decimal('1')
+
+# Сколько результатов parse_transaction_text и parse_management_command держать в памяти
+PARSE_CACHE_MAXSIZE = 4096
+_MISSING = object()
+
 
 class TextParserService:
     """Сервис для парсинга текстовых команд пользователей"""
     
-    def __init__(self):
-        # Улучшенные паттерны для валют
-        self.currency_patterns = {
-            'UZS': [
-                r'(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*сум(?:ов|а|ов)?',
-                r'(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*uzs',
-                r'(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*so\'m',
-                r'(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*сўм',
-                r'(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*som',
-            ],
-            'USD': [
-                r'(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*(?:\$|доллар(?:ов|а)?|usd|dollar)',
-                r'\$\s*(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)',
-                r'(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*бакс',
-            ],
-            'EUR': [
-                r'(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*(?:евро|eur|€)',
-                r'€\s*(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)',
-            ],
-            'RUB': [
-                r'(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*(?:рубл(?:ей|я|ь)|руб|rub)',
-                r'(\d+(?:[,\s]\d{3})*(?:[,.]\d{1,2})?)\s*₽',
-            ]
+    # (нормализованный текст, язык, валюта пользователя) -> результат парсинга.
+    # Общий для всех экземпляров: пользователи часто повторяют одни и те же фразы
+    _parse_cache: Dict[Tuple[str, str, str], Optional[Dict[str, Any]]] = {}
+    # Нормализованный текст -> разобранная команда управления (тот же размер и вытеснение)
+    _command_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+    
+    def __init__(self, languages: Sequence[str] = SUPPORTED_LANGUAGES):
+        """
+        Args:
+            languages: Языки, для которых строятся словари и выражения. Тексты на
+                остальных языках разбираются как на неизвестном (без ключевых слов,
+                с описанием и категорией по умолчанию), команды ищутся только на них
+        """
+        self.languages = tuple(lang for lang in SUPPORTED_LANGUAGES if lang in languages)
+        
+        if self.languages != SUPPORTED_LANGUAGES:
+            # Результаты урезанного парсера отличаются от общих - кэши свои
+            self._parse_cache = {}
+            self._command_cache = {}
+        
+        # Исходные словари общие для всех экземпляров (константы модуля),
+        # в экземпляре строятся только производные от них выражения
+        self.currency_patterns = CURRENCY_PATTERNS
+        self.currency_marker_regexes = CURRENCY_MARKER_REGEXES
+        self.number_words = {'ru': NUMBER_WORDS_RU}
+        self.expense_keywords = self._for_languages(EXPENSE_KEYWORDS)
+        self.management_keywords = self._for_languages(MANAGEMENT_KEYWORDS)
+        self.income_keywords = self._for_languages(INCOME_KEYWORDS)
+        self.prepositions = self._for_languages(PREPOSITIONS)
+        self.auto_categories = self._for_languages(AUTO_CATEGORIES)
+        
+        # Скомпилированные паттерны валют (в том же порядке приоритета)
+        self.currency_regexes = {
+            currency: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for currency, patterns in self.currency_patterns.items()
         }
         
-        # Словарь для распознавания чисел словами
-        self.number_words = {
-            'ru': {
-                'один': 1, 'одна': 1, 'одну': 1, 'одной': 1,
-                'два': 2, 'две': 2, 'двух': 2,
-                'три': 3, 'трех': 3, 'трём': 3,
-                'четыре': 4, 'четырех': 4, 'четырём': 4,
-                'пять': 5, 'пяти': 5, 'пятью': 5,
-                'шесть': 6, 'шести': 6, 'шестью': 6,
-                'семь': 7, 'семи': 7, 'семью': 7,
-                'восемь': 8, 'восьми': 8, 'восемью': 8,
-                'девять': 9, 'девяти': 9, 'девятью': 9,
-                'десять': 10, 'десяти': 10, 'десятью': 10,
-                'одиннадцать': 11, 'одиннадцати': 11,
-                'двенадцать': 12, 'двенадцати': 12,
-                'тринадцать': 13, 'тринадцати': 13,
-                'четырнадцать': 14, 'четырнадцати': 14,
-                'пятнадцать': 15, 'пятнадцати': 15,
-                'шестнадцать': 16, 'шестнадцати': 16,
-                'семнадцать': 17, 'семнадцати': 17,
-                'восемнадцать': 18, 'восемнадцати': 18,
-                'девятнадцать': 19, 'девятнадцати': 19,
-                'двадцать': 20, 'двадцати': 20, 'двадцатью': 20,
-                'тридцать': 30, 'тридцати': 30, 'тридцатью': 30,
-                'сорок': 40, 'сорока': 40,
-                'пятьдесят': 50, 'пятидесяти': 50, 'пятьюдесятью': 50,
-                'шестьдесят': 60, 'шестидесяти': 60,
-                'семьдесят': 70, 'семидесяти': 70,
-                'восемьдесят': 80, 'восьмидесяти': 80,
-                'девяносто': 90, 'девяноста': 90,
-                'сто': 100, 'ста': 100, 'сотню': 100,
-                'двести': 200, 'двухсот': 200,
-                'триста': 300, 'трехсот': 300,
-                'четыреста': 400, 'четырехсот': 400,
-                'пятьсот': 500, 'пятисот': 500,
-                'шестьсот': 600, 'шестисот': 600,
-                'семьсот': 700, 'семисот': 700,
-                'восемьсот': 800, 'восьмисот': 800,
-                'девятьсот': 900, 'девятисот': 900,
-                'тысяча': 1000, 'тысячи': 1000, 'тысяч': 1000, 'тысячу': 1000,
-                'миллион': 1000000, 'миллиона': 1000000, 'миллионов': 1000000,
-                'миллиард': 1000000000, 'миллиарда': 1000000000, 'миллиардов': 1000000000
-            }
+        # Любая фраза команды управления на любом языке. Большинство сообщений - не команды,
+        # и для них проверка ниже заменяет перебор всех фраз одним проходом по тексту
+        self.management_keywords_re = re.compile('|'.join(
+            re.escape(keyword)
+            for commands in self.management_keywords.values()
+            for keywords in commands.values()
+            for keyword in keywords
+        ))
+        # То же по каждому языку отдельно: фразы перебираются только для языков,
+        # чьи команды действительно встречаются в тексте
+        self.management_language_regexes = {
+            lang: re.compile('|'.join(
+                re.escape(keyword)
+                for keywords in commands.values()
+                for keyword in keywords
+            ))
+            for lang, commands in self.management_keywords.items()
         }
+        # Плоская таблица (тип команды, фраза) на язык в порядке проверки команд:
+        # один цикл вместо отдельного цикла на каждый тип команды
+        self.management_command_table = {
+            lang: tuple(
+                (command_type, keyword)
+                for command_type in MANAGEMENT_COMMAND_ORDER
+                for keyword in commands.get(command_type, ())
+            )
+            for lang, commands in self.management_keywords.items()
+        }
+        
+        # Ключевые слова типа транзакции одним регулярным выражением на язык:
+        # вхождение любого слова находится за один проход (как и раньше, без границ слов)
+        self.expense_regexes = self._compile_keyword_alternations(self.expense_keywords)
+        self.income_regexes = self._compile_keyword_alternations(self.income_keywords)
         
-        # Ключевые слова для типов транзакций
-        self.expense_keywords = {
-            'ru': ['потратил', 'купил', 'заплатил', 'потрачено', 'расход', 'трата', 'оплатил', 'заплачено', 'взял', 'приобрел', 'истратил', 'потрати'],
-            'en': ['spent', 'bought', 'paid', 'expense', 'cost', 'purchase', 'got', 'acquired', 'buy'],
-            'uz': ['sarfladim', 'sotib oldim', 'to\'ladim', 'xarajat', 'pul sarflandi', 'sotib oldi']
+        # Расходы и доходы в одном выражении: если ключевых слов нет (частый случай
+        # "просто сумма"), текст просматривается один раз, а не дважды
+        self.transaction_type_regexes = {
+            lang: re.compile('|'.join(
+                f'(?P<{kind}>{regexes[lang].pattern})'
+                for kind, regexes in (('expense', self.expense_regexes), ('income', self.income_regexes))
+                if lang in regexes
+            ))
+            for lang in self.expense_regexes.keys() | self.income_regexes.keys()
         }
         
-        # Команды управления настройками + КОМАНДЫ УДАЛЕНИЯ
-        self.management_keywords = {
-            'ru': {
-                'language': ['поменяй язык', 'смени язык', 'установи язык', 'язык на', 'переключи язык'],
-                'currency': ['смени валюту', 'поменяй валюту', 'установи валюту', 'валюта на', 'сделай валютой'],
-                'create_category': ['создай категорию', 'добавь категорию', 'новая категория'],
-                'delete_category': ['удали категорию', 'удалить категорию', 'убери категорию', 'стереть категорию'],
-                'delete_transaction': ['удали транзакцию', 'удалить транзакцию', 'отмени операцию', 'убери операцию']
-            },
-            'en': {
-                'language': ['change language', 'set language', 'switch language', 'language to'],
-                'currency': ['change currency', 'set currency', 'switch currency', 'currency to'],
-                'create_category': ['create category', 'add category', 'new category'],
-                'delete_category': ['delete category', 'remove category', 'erase category'],
-                'delete_transaction': ['delete transaction', 'remove transaction', 'cancel operation']
-            },
-            'uz': {
-                'language': ['tilni o\'zgartir', 'til o\'rnat', 'tilni almashtir'],
-                'currency': ['valyutani o\'zgartir', 'valyuta o\'rnat', 'valyutani almashtir'],
-                'create_category': ['kategoriya yarat', 'kategoriya qo\'sh', 'yangi kategoriya'],
-                'delete_category': ['kategoriyani o\'chir', 'kategoriya o\'chir', 'kategoriyani olib tashla'],
-                'delete_transaction': ['operatsiyani o\'chir', 'tranzaksiyani o\'chir', 'operatsiya bekor qil']
-            }
+        # Все ключевые слова транзакций языка (сначала расходы, потом доходы)
+        self.transaction_keywords = {
+            lang: tuple(self.expense_keywords.get(lang, []) + self.income_keywords.get(lang, []))
+            for lang in self.expense_keywords.keys() | self.income_keywords.keys()
         }
         
-        self.income_keywords = {
-            'ru': ['заработал', 'получил', 'доход', 'зарплата', 'прибыль', 'заработано', 'поступило'],
-            'en': ['earned', 'received', 'income', 'salary', 'profit', 'got'],
-            'uz': ['ishlab topdim', 'oldim', 'daromad', 'maosh', 'foyda']
+        # Паттерны очистки описания: все ключевые слова транзакций языка и все предлоги
+        # языка - по одному выражению с границами слов, чтобы убирать их за один проход
+        self.keyword_strip_regexes = {
+            lang: self._compile_word_alternation(keywords)
+            for lang, keywords in self.transaction_keywords.items()
+        }
+        # Оставшиеся числа и предлоги убираются одним проходом: совпадения не пересекаются
+        # (числа начинаются с цифры, предлоги - с буквы), поэтому порядок не важен
+        self.number_and_preposition_regexes = {
+            lang: re.compile(
+                f'{STANDALONE_NUMBER_RE.pattern}|{self._compile_word_alternation(preps).pattern}',
+                re.IGNORECASE
+            )
+            for lang, preps in self.prepositions.items()
         }
         
-        # ЗНАЧИТЕЛЬНО РАСШИРЕННЫЕ автоматические категории с огромным количеством товаров
-        self.auto_categories = {
-            'ru': {
-                'еда': [
-                    # Молочные продукты
-                    'молоко', 'кефир', 'ряженка', 'йогурт', 'творог', 'сметана', 'масло сливочное', 'сыр', 'брынза', 'кисломолочные',
-                    
-                    # Хлебобулочные
-                    'хлеб', 'батон', 'багет', 'лаваш', 'сдоба', 'булочки', 'печенье', 'торт', 'пирожки', 'кекс',
-                    
-                    # Мясо и рыба
-                    'мясо', 'говядина', 'свинина', 'баранина', 'курица', 'индейка', 'колбаса', 'сосиски', 'ветчина', 'рыба', 'семга', 'окунь', 'треска',
-                    
-                    # Овощи и фрукты
-                    'овощи', 'фрукты', 'яблоки', 'бананы', 'апельсины', 'мандарины', 'груши', 'виноград', 'картошка', 'лук', 'морковь', 'капуста', 'помидоры', 'огурцы', 'перец', 'свекла',
-                    
-                    # Крупы и макароны
-                    'рис', 'гречка', 'овсянка', 'манка', 'макароны', 'спагетти', 'лапша', 'пшено', 'перловка',
-                    
-                    # Консервы и заморозка
-                    'консервы', 'тушенка', 'компот', 'варенье', 'мороженое', 'замороженные овощи', 'пельмени', 'вареники',
-                    
-                    # Приправы и соусы
-                    'соль', 'сахар', 'мука', 'масло растительное', 'уксус', 'приправы', 'кетчуп', 'майонез', 'горчица',
-                    
-                    # Напитки
-                    'вода', 'сок', 'лимонад', 'чай', 'кофе', 'пиво', 'вино', 'коньяк', 'водка',
-                    
-                    # Общие
-                    'продукты', 'еда', 'пища', 'супермаркет', 'магазин продуктов', 'продуктовый', 'гастроном', 'ресторан', 'кафе', 'столовая', 'обед', 'ужин', 'завтрак'
-                ],
-                
-                'транспорт': [
-                    'бензин', 'топливо', 'дизель', 'газ пропан', 'автобус', 'метро', 'машина', 'авто', 'автомобиль', 'проезд', 'парковка', 'гараж', 'мойка', 'шиномонтаж', 'техосмотр', 'страховка авто', 'запчасти'
-                ],
-                
-                'такси': [
-                    'такси', 'uber', 'yandex такси', 'яндекс такси', 'bolt', 'поездка', 'машина такси', 'трансфер'
-                ],
-                
-                'коммунальные': [
-                    'свет', 'электричество', 'газ', 'вода', 'интернет', 'телефон', 'коммуналка', 'коммунальные', 'отопление', 'канализация', 'домофон', 'кабельное тв', 'мобильная связь'
-                ],
-                
-                'одежда': [
-                    # Верхняя одежда
-                    'одежда', 'куртка', 'пальто', 'шуба', 'плащ', 'ветровка', 'пуховик',
-                    
-                    # Обувь
-                    'обувь', 'ботинки', 'сапоги', 'туфли', 'кроссовки', 'тапочки', 'сандалии', 'босоножки',
-                    
-                    # Повседневная одежда
-                    'джинсы', 'брюки', 'штаны', 'юбка', 'платье', 'рубашка', 'блузка', 'футболка', 'свитер', 'кофта', 'пиджак', 'костюм',
-                    
-                    # Нижнее белье и аксессуары
-                    'белье', 'носки', 'колготки', 'трусы', 'бюстгальтер', 'шапка', 'шарф', 'перчатки', 'ремень', 'сумка', 'рюкзак',
-                    
-                    # Места покупок
-                    'магазин одежды', 'бутик', 'секонд-хенд'
-                ],
-                
-                'развлечения': [
-                    'кино', 'театр', 'игры', 'книги', 'музыка', 'концерт', 'клуб', 'дискотека', 'боулинг', 'бильярд', 'караоке', 'парк развлечений', 'аттракционы', 'цирк', 'музей', 'выставка'
-                ],
-                
-                'здоровье': [
-                    'лекарства', 'врач', 'больница', 'аптека', 'медицина', 'поликлиника', 'стоматолог', 'анализы', 'узи', 'рентген', 'прививка', 'операция', 'массаж', 'физиотерапия'
-                ],
-                
-                'работа': [
-                    'зарплата', 'премия', 'работа', 'подработка', 'бонус', 'аванс', 'доплата', 'надбавка'
-                ],
-                
-                'вредные привычки': [
-                    'сигареты', 'курение', 'табак', 'сигары', 'кальян', 'алкоголь', 'пиво', 'вино', 'водка', 'коньяк', 'виски', 'шампанское', 'самогон'
-                ],
-                
-                'красота': [
-                    'парикмахер', 'маникюр', 'педикюр', 'салон красоты', 'косметика', 'крем', 'шампунь', 'мыло', 'духи', 'помада', 'тушь', 'стрижка', 'окрашивание', 'укладка'
-                ],
-                
-                'образование': [
-                    'курсы', 'книги', 'обучение', 'университет', 'школа', 'репетитор', 'семинар', 'тренинг', 'мастер-класс', 'учебники', 'канцелярия', 'тетради', 'ручки'
-                ],
-                
-                'дом': [
-                    # Мебель
-                    'мебель', 'диван', 'кровать', 'стол', 'стул', 'шкаф', 'комод', 'полка',
-                    
-                    # Бытовая техника
-                    'холодильник', 'стиральная машина', 'микроволновка', 'телевизор', 'пылесос', 'утюг', 'чайник', 'мультиварка',
-                    
-                    # Ремонт и строительство
-                    'ремонт', 'краска', 'обои', 'плитка', 'линолеум', 'ламинат', 'гвозди', 'шурупы', 'инструменты', 'строительство', 'декор', 'посуда', 'кастрюли', 'сковородки'
-                ],
-                
-                'спорт': [
-                    'спортзал', 'фитнес', 'тренажерный зал', 'бассейн', 'йога', 'танцы', 'спортивная одежда', 'кроссовки для спорта', 'абонемент'
-                ],
-                
-                'хобби': [
-                    'рукоделие', 'вязание', 'шитье', 'вышивание', 'рисование', 'краски', 'кисти', 'холст', 'пазлы', 'конструктор'
-                ],
-                
-                'подарки': [
-                    'подарок', 'сувенир', 'цветы', 'букет', 'торт на день рождения', 'открытка', 'игрушка'
-                ],
-                
-                'животные': [
-                    'корм для животных', 'ветеринар', 'зоомагазин', 'игрушки для животных', 'ошейник', 'поводок'
-                ]
-            },
-            
-            'en': {
-                'food': [
-                    'groceries', 'milk', 'bread', 'meat', 'vegetables', 'fruits', 'food', 'restaurant', 'cafe', 'apples', 'bananas', 'chicken', 'beef', 'cheese', 'yogurt', 'butter', 'eggs', 'rice', 'pasta', 'fish', 'supermarket', 'grocery store'
-                ],
-                'transport': ['gas', 'fuel', 'bus', 'metro', 'taxi', 'car', 'auto', 'parking', 'garage'],
-                'utilities': ['electricity', 'gas', 'water', 'internet', 'phone', 'heating'],
-                'clothing': ['clothes', 'shoes', 'jacket', 'jeans', 'dress', 'shirt', 'boots', 'sneakers'],
-                'entertainment': ['cinema', 'movies', 'games', 'books', 'music', 'concert', 'club'],
-                'health': ['medicine', 'doctor', 'hospital', 'pharmacy', 'dentist'],
-                'work': ['salary', 'bonus', 'work', 'job', 'wage'],
-                'home': ['furniture', 'repair', 'tools', 'construction', 'decoration']
-            },
-            
-            'uz': {
-                'oziq-ovqat': [
-                    'mahsulotlar', 'sut', 'non', 'go\'sht', 'sabzavot', 'meva', 'ovqat', 'restoran', 'olma', 'banan', 'tovuq', 'mol go\'shti', 'pishloq', 'yogurt', 'sariyog', 'tuxum', 'guruch', 'makaron', 'baliq'
-                ],
-                'transport': ['benzin', 'yoqilg\'i', 'avtobus', 'metro', 'taksi', 'mashina'],
-                'kommunal': ['elektr', 'gaz', 'suv', 'internet', 'telefon'],
-                'kiyim': ['kiyim', 'oyoq kiyim', 'kurtka', 'jinsi', 'ko\'ylak'],
-                'o\'yin-kulgi': ['kino', 'teatr', 'o\'yinlar', 'kitoblar', 'musiqa'],
-                'salomatlik': ['dori', 'shifokor', 'kasalxona', 'dorixona'],
-                'ish': ['maosh', 'mukofot', 'ish', 'ishlab topish']
+        # Ключевые слова каждой категории одним выражением (в нижнем регистре).
+        # Порядок категорий сохраняется: побеждает первая категория, как и раньше
+        self.category_regexes = {
+            lang: [
+                (category_name, re.compile('|'.join(re.escape(keyword.lower()) for keyword in keywords)))
+                for category_name, keywords in categories.items()
+                if keywords
+            ]
+            for lang, categories in self.auto_categories.items()
+        }
+        
+        # Обратный индекс ключевое слово -> категория. Описание часто состоит из одного
+        # ключевого слова ("такси", "хлеб"), и тогда категория находится одним обращением
+        # к словарю. Значение считается тем же перебором, что и в _auto_detect_category,
+        # поэтому совпадает с ним и для слов, встречающихся в нескольких категориях
+        self.keyword_categories = {
+            lang: {
+                keyword.lower(): self._match_category(keyword.lower(), lang)
+                for keywords in categories.values()
+                for keyword in keywords
             }
+            for lang, categories in self.auto_categories.items()
         }
     
     async def parse_transaction_text(self, text: str, language: str = 'ru', user_currency: str = 'UZS') -> Optional[Dict[str, Any]]:
@@ -273,9 +537,47 @@ class TextParserService:
         Returns:
             Словарь с данными транзакции или None
         """
+        if not isinstance(text, str):
+            return None
+        
+        text = text.lower().strip()
+        cache_key = (text, language, user_currency)
+        
+        result = self._parse_cache.pop(cache_key, _MISSING)
+        if result is _MISSING:
+            result = await self._parse_transaction_text(text, language, user_currency)
+            self._cache_result(self._parse_cache, cache_key, result)
+        else:
+            # Возвращаем запись в конец - вытесняются давно не использованные
+            self._parse_cache[cache_key] = result
+        
+        # Отдаём копию, чтобы вызывающий код не испортил закэшированный результат
+        return dict(result) if result is not None else None
+    
+    @staticmethod
+    def _cache_result(
+        cache: Dict[Any, Optional[Dict[str, Any]]], 
+        cache_key: Any, 
+        result: Optional[Dict[str, Any]]
+    ) -> None:
+        """Сохраняет результат парсинга, вытесняя самую старую запись при переполнении"""
+        if len(cache) >= PARSE_CACHE_MAXSIZE:
+            try:
+                cache.pop(next(iter(cache)), None)
+            except (StopIteration, RuntimeError):
+                # Кэш одновременно меняется из другого потока - пропускаем вытеснение
+                pass
+        
+        cache[cache_key] = result
+    
+    async def _parse_transaction_text(
+        self, 
+        text: str, 
+        language: str, 
+        user_currency: str
+    ) -> Optional[Dict[str, Any]]:
+        """Парсинг уже нормализованного (lower/strip) текста без кэша"""
         try:
-            text = text.lower().strip()
-            
             # 1. Определяем тип транзакции
             transaction_type = self._detect_transaction_type(text, language)
             if not transaction_type:
@@ -314,6 +616,33 @@ class TextParserService:
             logger.error(f"Error parsing transaction text: {e}")
             return None
 
+    async def parse_batch(
+        self,
+        texts: List[str],
+        language: str = 'ru',
+        kind: str = 'transaction',
+        user_currency: str = 'UZS'
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Парсит список текстов за один вызов
+        
+        Args:
+            texts: Тексты для парсинга
+            language: Язык текстов
+            kind: 'transaction' - транзакции, 'management' - команды управления
+            user_currency: Валюта пользователя для конвертации (для транзакций)
+            
+        Returns:
+            Список результатов в том же порядке, что и texts (None - не распознано)
+        """
+        if kind == 'management':
+            return [self.parse_management_command(text, language) for text in texts]
+        
+        return [
+            await self.parse_transaction_text(text, language, user_currency)
+            for text in texts
+        ]
+
     def parse_management_command(self, text: str, language: str = 'ru') -> Optional[Dict[str, Any]]:
         """
         Парсит команды управления (смена языка, валюты, создание категорий, УДАЛЕНИЕ)
@@ -324,91 +653,108 @@ class TextParserService:
         try:
             text = text.lower().strip()
             
-            # Проверяем команды для всех языков (мультиязычность)
-            for lang in ['ru', 'en', 'uz']:
-                commands = self.management_keywords.get(lang, {})
-                
-                # Проверяем смену языка
-                for keyword in commands.get('language', []):
-                    if keyword in text:
-                        target_lang = self._extract_target_language(text)
-                        return {
-                            'type': 'change_language',
-                            'target_language': target_lang,
-                            'source': 'management'
-                        }
-                
-                # Проверяем смену валюты
-                for keyword in commands.get('currency', []):
-                    if keyword in text:
-                        target_currency = self._extract_target_currency(text)
-                        return {
-                            'type': 'change_currency',
-                            'target_currency': target_currency,
-                            'source': 'management'
-                        }
-                
-                # Проверяем УДАЛЕНИЕ КАТЕГОРИИ
-                for keyword in commands.get('delete_category', []):
-                    if keyword in text:
-                        category_name = self._extract_delete_target(text, keyword)
-                        if category_name:
-                            return {
-                                'type': 'delete_category',
-                                'category_name': category_name,
-                                'source': 'management'
-                            }
-                
-                # Проверяем УДАЛЕНИЕ ТРАНЗАКЦИИ
-                for keyword in commands.get('delete_transaction', []):
-                    if keyword in text:
-                        # Для транзакций можем искать номер или описание
-                        target = self._extract_delete_target(text, keyword)
-                        if target:
-                            return {
-                                'type': 'delete_transaction',
-                                'target': target,
-                                'source': 'management'
-                            }
-                
-                # Проверяем создание категории
-                for keyword in commands.get('create_category', []):
-                    if keyword in text:
-                        category_name = self._extract_category_name(text, keyword)
-                        if category_name:
-                            return {
-                                'type': 'create_category',
-                                'category_name': category_name,
-                                'source': 'management'
-                            }
+            # Ни одной фразы команды в тексте - перебирать их по одной незачем
+            if not self.management_keywords_re.search(text):
+                return None
             
-            return None
+            # Результат не зависит от language: команды ищутся на всех языках сразу
+            result = self._command_cache.pop(text, _MISSING)
+            if result is _MISSING:
+                result = self._parse_management_command(text)
+                self._cache_result(self._command_cache, text, result)
+            else:
+                # Возвращаем запись в конец - вытесняются давно не использованные
+                self._command_cache[text] = result
+            
+            # Отдаём копию, чтобы вызывающий код не испортил закэшированный результат
+            return dict(result) if result is not None else None
             
         except Exception as e:
             logger.error(f"Error parsing management command: {e}")
             return None
 
+    def _parse_management_command(self, text: str) -> Optional[Dict[str, Any]]:
+        """Разбор команды в уже нормализованном (lower/strip) тексте без кэша"""
+        
+        # Проверяем команды для всех языков (мультиязычность)
+        for lang in self.languages:
+            if not self.management_language_regexes[lang].search(text):
+                continue
+            
+            for command_type, keyword in self.management_command_table[lang]:
+                if keyword in text:
+                    command = self._build_management_command(command_type, text, keyword)
+                    if command:
+                        return command
+        
+        return None
+
+    def _build_management_command(self, command_type: str, text: str, keyword: str) -> Optional[Dict[str, Any]]:
+        """Собирает команду по найденной фразе (None, если у команды не нашлось аргумента)"""
+        
+        # Смена языка
+        if command_type == 'language':
+            return {
+                'type': 'change_language',
+                'target_language': self._extract_target_language(text),
+                'source': 'management'
+            }
+        
+        # Смена валюты
+        if command_type == 'currency':
+            return {
+                'type': 'change_currency',
+                'target_currency': self._extract_target_currency(text),
+                'source': 'management'
+            }
+        
+        # УДАЛЕНИЕ КАТЕГОРИИ
+        if command_type == 'delete_category':
+            category_name = self._extract_delete_target(text, keyword)
+            if category_name:
+                return {
+                    'type': 'delete_category',
+                    'category_name': category_name,
+                    'source': 'management'
+                }
+            return None
+        
+        # УДАЛЕНИЕ ТРАНЗАКЦИИ: для транзакций можем искать номер или описание
+        if command_type == 'delete_transaction':
+            target = self._extract_delete_target(text, keyword)
+            if target:
+                return {
+                    'type': 'delete_transaction',
+                    'target': target,
+                    'source': 'management'
+                }
+            return None
+        
+        # Создание категории
+        category_name = self._extract_category_name(text, keyword)
+        if category_name:
+            return {
+                'type': 'create_category',
+                'category_name': category_name,
+                'source': 'management'
+            }
+        return None
+
     def _extract_target_language(self, text: str) -> str:
         """Извлекает целевой язык из команды"""
-        if any(word in text for word in ['русский', 'russian', 'ru']):
-            return 'ru'
-        elif any(word in text for word in ['английский', 'english', 'en']):
-            return 'en'
-        elif any(word in text for word in ['узбекский', 'uzbek', 'uz', 'o\'zbek']):
-            return 'uz'
-        return 'ru'  # по умолчанию
+        return self._match_code(text, TARGET_LANGUAGE_REGEXES, 'ru')  # по умолчанию русский
     
     def _extract_target_currency(self, text: str) -> str:
         """Извлекает целевую валюту из команды"""
-        if any(word in text for word in ['доллар', 'dollar', 'usd', '$']):
-            return 'USD'
-        elif any(word in text for word in ['евро', 'euro', 'eur', '€']):
-            return 'EUR'
-        elif any(word in text for word in ['рубль', 'ruble', 'rub', '₽']):
-            return 'RUB'
-        elif any(word in text for word in ['сум', 'som', 'uzs']):
-            return 'UZS'
-        return 'UZS'  # по умолчанию
+        return self._match_code(text, TARGET_CURRENCY_REGEXES, 'UZS')  # по умолчанию сум
+    
+    @staticmethod
+    def _match_code(text: str, regexes: Sequence[Tuple[str, 're.Pattern[str]']], default: str) -> str:
+        """Первый по приоритету код, одно из слов которого встречается в тексте"""
+        for code, words_re in regexes:
+            if words_re.search(text):
+                return code
+        return default
     
     def _extract_category_name(self, text: str, keyword: str) -> Optional[str]:
         """Извлекает название категории из команды"""
@@ -417,7 +763,7 @@ class TextParserService:
         if len(parts) > 1:
             category_name = parts[1].strip()
             # Убираем лишние слова
-            category_name = re.sub(r'\b(для|with|uchun)\b', '', category_name).strip()
+            category_name = CATEGORY_NAME_STOPWORDS_RE.sub('', category_name).strip()
             return category_name if category_name else None
         return None
     
@@ -428,7 +774,7 @@ class TextParserService:
         if len(parts) > 1:
             target_name = parts[1].strip()
             # Убираем лишние слова и предлоги
-            target_name = re.sub(r'\b(для|with|uchun|под|номер|number|raqam)\b', '', target_name).strip()
+            target_name = DELETE_TARGET_STOPWORDS_RE.sub('', target_name).strip()
             
             # Если это может быть номер транзакции
             if target_name.isdigit():
@@ -440,25 +786,51 @@ class TextParserService:
                 
         return None
     
+    def _for_languages(self, table: Dict[str, Any]) -> Dict[str, Any]:
+        """Часть словаря по языкам только для включённых языков парсера"""
+        if self.languages == SUPPORTED_LANGUAGES:
+            return table
+        return {lang: value for lang, value in table.items() if lang in self.languages}
+    
+    @staticmethod
+    def _compile_keyword_alternations(keywords: Dict[str, List[str]]) -> Dict[str, 're.Pattern[str]']:
+        """Собирает ключевые слова каждого языка в одно выражение вида 'слово1|слово2|...'"""
+        return {
+            lang: re.compile('|'.join(re.escape(word) for word in words))
+            for lang, words in keywords.items()
+            if words
+        }
+    
+    @staticmethod
+    def _compile_word_alternation(words: Sequence[str]) -> 're.Pattern[str]':
+        """Одно выражение '\\b(?:слово1|слово2|...)\\b' вместо отдельного паттерна на каждое слово"""
+        return re.compile(
+            r'\b(?:' + '|'.join(re.escape(word) for word in words) + r')\b',
+            re.IGNORECASE
+        )
+    
     def _detect_transaction_type(self, text: str, language: str) -> Optional[str]:
         """Определяет тип транзакции (доход/расход)"""
         
-        # Проверяем ключевые слова расходов
-        expense_words = self.expense_keywords.get(language, [])
-        for word in expense_words:
-            if word in text:
-                logger.info(f"Detected expense by keyword: '{word}'")
-                return 'expense'
-        
-        # Проверяем ключевые слова доходов  
-        income_words = self.income_keywords.get(language, [])
-        for word in income_words:
-            if word in text:
-                logger.info(f"Detected income by keyword: '{word}'")
+        # Ищем первое ключевое слово расхода или дохода
+        type_re = self.transaction_type_regexes.get(language)
+        match = type_re.search(text) if type_re else None
+        
+        if match and match.lastgroup == 'income':
+            # Расходы приоритетнее: слово расхода может стоять дальше в тексте
+            expense_re = self.expense_regexes.get(language)
+            expense_match = expense_re.search(text, match.start() + 1) if expense_re else None
+            if not expense_match:
+                logger.info(f"Detected income by keyword: '{match.group(0)}'")
                 return 'income'
+            match = expense_match
+        
+        if match:
+            logger.info(f"Detected expense by keyword: '{match.group(0)}'")
+            return 'expense'
         
         # Если есть числа и нет ключевых слов - считаем расходом
-        if re.search(r'\d+', text):
+        if DIGITS_RE.search(text):
             logger.info("No keywords found, defaulting to expense")
             return 'expense'
         
@@ -466,10 +838,11 @@ class TextParserService:
         return None
     
     def _extract_amount_and_currency(self, text: str) -> tuple[Optional[Decimal], str]:
-        """Извлекает сумму и валюту из текста"""
+        """Извлекает сумму и валюту из текста (text уже в нижнем регистре)"""
         
-        # Нормализуем текст - убираем лишние пробелы
-        text = re.sub(r'\s+', ' ', text.strip())
+        # Нормализуем текст - убираем лишние пробелы. split() без аргументов режет
+        # по тем же пробельным символам, что и \s, но без запуска регулярного выражения
+        text = ' '.join(text.split())
         
         # Сначала пробуем найти числа словами с валютой
         words_amount, words_currency = self._extract_amount_from_words(text)
@@ -477,14 +850,24 @@ class TextParserService:
             logger.info(f"Found amount from words: {words_amount} {words_currency}")
             return words_amount, words_currency
         
+        # Все паттерны валют и чисел ниже начинаются с цифры или содержат её -
+        # без цифр в тексте ни один из них не сработает
+        if not DIGITS_RE.search(text):
+            logger.warning(f"No amount found in text: '{text}'")
+            return None, 'UZS'
+        
         # Проверяем каждую валюту с улучшенными паттернами
-        for currency, patterns in self.currency_patterns.items():
+        for currency, patterns in self.currency_regexes.items():
+            # Быстрая проверка: без обозначения валюты ни один её паттерн не сработает
+            if not self.currency_marker_regexes[currency].search(text):
+                continue
+            
             for pattern in patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
+                matches = pattern.finditer(text)
                 for match in matches:
-                    amount_str = match.group(1)
-                    # Убираем все пробелы и заменяем запятые на точки для десятичных
-                    amount_str = re.sub(r'\s', '', amount_str)
+                    # Убираем пробелы (после нормализации выше других пробельных символов
+                    # в тексте нет) и заменяем запятые на точки для десятичных
+                    amount_str = match.group(1).replace(' ', '')
                     
                     # Обрабатываем запятые: если это тысячи (1,500) или десятичные (1,50)
                     if ',' in amount_str:
@@ -500,129 +883,59 @@ class TextParserService:
                     try:
                         amount = Decimal(amount_str)
                         if amount > 0:  # Проверяем что сумма положительная
-                            logger.info(f"Found {amount} {currency} using pattern: {pattern}")
+                            logger.info(f"Found {amount} {currency} using pattern: {pattern.pattern}")
                             return amount, currency
                     except (InvalidOperation, ValueError) as e:
                         logger.warning(f"Failed to parse amount '{amount_str}': {e}")
                         continue
         
-        # Улучшенный поиск просто чисел
-        number_patterns = [
-            r'(\d+(?:\.\d{1,2})?)',      # 10000.50, 15.99
-            r'(\d+(?:\s\d{3})*)',        # 10 000, 1 000 000
-            r'(\d+(?:,\d{3})*)',         # 10,000, 1,000,000
-            r'(\d{1,3}(?:[\s,]\d{3})*)', # 1,000 или 1 000
-            r'(\d+)',                    # просто число
-        ]
-        
-        for pattern in number_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                amount_str = match.group(1)
-                # Убираем пробелы и обрабатываем запятые правильно
-                amount_str = re.sub(r'\s', '', amount_str)
-                
-                # Обрабатываем запятые: если это тысячи (1,500) или десятичные (1,50)
-                if ',' in amount_str:
-                    parts = amount_str.split(',')
-                    if len(parts) == 2:
-                        # Если после запятой 3 цифры - это тысячи
-                        if len(parts[1]) == 3 and parts[1].isdigit():
-                            amount_str = parts[0] + parts[1]  # 1,500 → 1500
-                        # Если после запятой 1-2 цифры - это десятичные
-                        elif len(parts[1]) <= 2 and parts[1].isdigit():
-                            amount_str = parts[0] + '.' + parts[1]  # 1,50 → 1.50
-                
-                try:
-                    amount = Decimal(amount_str)
-                    if amount > 0:  # Проверяем что сумма положительная
-                        logger.info(f"Found number {amount} (defaulting to UZS)")
-                        return amount, 'UZS'  # По умолчанию сум
-                except (InvalidOperation, ValueError) as e:
-                    logger.warning(f"Failed to parse number '{amount_str}': {e}")
-                    continue
+        # Поиск просто чисел
+        for match in NUMBER_RE.finditer(text):
+            amount = Decimal(match.group(0))
+            if amount > 0:  # Проверяем что сумма положительная
+                logger.info(f"Found number {amount} (defaulting to UZS)")
+                return amount, 'UZS'  # По умолчанию сум
         
         logger.warning(f"No amount found in text: '{text}'")
         return None, 'UZS'
 
     def _extract_amount_from_words(self, text: str) -> tuple[Optional[Decimal], str]:
-        """Извлекает сумму из слов (тысяча долларов, одна тысяча сум и т.д.)"""
-        
-        text_lower = text.lower()
+        """Извлекает сумму из слов (тысяча долларов, одна тысяча сум и т.д.), text уже в нижнем регистре"""
         
-        # Определяем валюту из текста
-        detected_currency = 'UZS'  # по умолчанию
+        if not NUMBER_WORD_CURRENCY_RE.search(text):
+            return None, 'UZS'
         
-        currency_keywords = {
-            'USD': ['доллар', 'долларов', 'dollaro', 'usd', '$'],
-            'EUR': ['евро', 'eur', '€'],
-            'RUB': ['рубл', 'руб', 'rub', '₽'],
-            'UZS': ['сум', 'сом', 'uzs', 'so\'m']
-        }
-        
-        for currency, keywords in currency_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
-                detected_currency = currency
-                break
-        
-        # Паттерны для чисел словами с валютой
-        number_word_patterns = [
-            # "одна тысяча долларов", "тысяча долларов"
-            r'(?:одн[ауо]?\s+)?тысяч[ауи]?\s+(?:доллар|сум|рубл|евро)',
-            # "две тысячи долларов", "пять тысяч сум"
-            r'(?:дв[ае]|три|четыре|пять|шесть|семь|восемь|девять|десять)\s+тысяч[иь]?\s+(?:доллар|сум|рубл|евро)',
-            # просто "тысяча долларов"
-            r'тысяч[ауи]?\s+(?:доллар|сум|рубл|евро)',
-            # "сто долларов", "двести сум" и т.д.
-            r'(?:сто|двести|триста|четыреста|пятьсот|шестьсот|семьсот|восемьсот|девятьсот)\s+(?:доллар|сум|рубл|евро)',
-            # "пятьдесят долларов" и т.д.
-            r'(?:десять|двадцать|тридцать|сорок|пятьдесят|шестьдесят|семьдесят|восемьдесят|девяносто)\s+(?:доллар|сум|рубл|евро)'
-        ]
-        
-        for pattern in number_word_patterns:
-            match = re.search(pattern, text_lower)
+        for pattern in NUMBER_WORD_PATTERNS:
+            match = pattern.search(text)
             if match:
-                matched_text = match.group(0)
-                amount = self._parse_number_words(matched_text)
+                amount = self._parse_number_words(match.group(0))
                 if amount:
-                    return Decimal(amount), detected_currency
+                    return Decimal(amount), self._match_code(text, WORDS_CURRENCY_REGEXES, 'UZS')
         
-        return None, detected_currency
+        return None, 'UZS'
 
     def _parse_number_words(self, text: str) -> Optional[int]:
-        """Парсит числа из слов в числовое значение"""
+        """Парсит числа из слов в числовое значение (text уже в нижнем регистре)"""
         
-        words = text.lower().split()
-        number_words_dict = self.number_words.get('ru', {})
+        get_value = NUMBER_WORDS_RU.get
         
         total = 0
         current = 0
         
-        for word in words:
+        for word in text.split():
             # Пропускаем валютные слова
-            if word in ['доллар', 'долларов', 'сум', 'сом', 'рубл', 'рублей', 'евро']:
+            if word in NUMBER_CURRENCY_WORDS:
                 continue
-                
-            if word in number_words_dict:
-                value = number_words_dict[word]
-                
-                if value == 1000:
-                    if current == 0:
-                        current = 1
-                    total += current * 1000
-                    current = 0
-                elif value == 1000000:
-                    if current == 0:
-                        current = 1
-                    total += current * 1000000
-                    current = 0
-                elif value == 1000000000:
-                    if current == 0:
-                        current = 1
-                    total += current * 1000000000
-                    current = 0
-                else:
-                    current += value
+            
+            value = get_value(word)
+            if value is None:
+                continue
+            
+            if value in NUMBER_SCALES:
+                total += (current or 1) * value
+                current = 0
+            else:
+                current += value
         
         total += current
         
@@ -634,26 +947,9 @@ class TextParserService:
         if from_currency == to_currency:
             return amount
         
-        # Базовые курсы (в реальном проекте должны получаться из API)
-        exchange_rates = {
-            'USD_UZS': 12300,
-            'EUR_UZS': 13400,
-            'RUB_UZS': 135,
-            'UZS_USD': 1 / 12300,
-            'UZS_EUR': 1 / 13400,
-            'UZS_RUB': 1 / 135,
-            'USD_EUR': 0.92,
-            'EUR_USD': 1.09,
-            'USD_RUB': 91,
-            'RUB_USD': 1 / 91,
-            'EUR_RUB': 99,
-            'RUB_EUR': 1 / 99
-        }
+        rate = EXCHANGE_RATES.get((from_currency, to_currency), DEFAULT_EXCHANGE_RATE)
         
-        rate_key = f"{from_currency}_{to_currency}"
-        rate = exchange_rates.get(rate_key, 1)
-        
-        converted_amount = amount * Decimal(str(rate))
+        converted_amount = amount * rate
         
         logger.info(f"Converted {amount} {from_currency} to {converted_amount:.2f} {to_currency} (rate: {rate})")
         
@@ -666,34 +962,16 @@ class TextParserService:
         clean_text = text
         
         # Убираем ключевые слова транзакций
-        all_keywords = (
-            self.expense_keywords.get(language, []) + 
-            self.income_keywords.get(language, [])
-        )
-        
-        for keyword in all_keywords:
-            # Используем более точный паттерн с границами слов
-            pattern = rf'\b{re.escape(keyword)}\b'
-            clean_text = re.sub(pattern, '', clean_text, flags=re.IGNORECASE)
+        keyword_re = self.keyword_strip_regexes.get(language)
+        if keyword_re:
+            clean_text = keyword_re.sub('', clean_text)
         
         # Убираем валютные паттерны (сначала сохраняем найденные суммы)
-        for currency, patterns in self.currency_patterns.items():
-            for pattern in patterns:
-                clean_text = re.sub(pattern, '', clean_text, flags=re.IGNORECASE)
-        
-        # Убираем оставшиеся числа
-        clean_text = re.sub(r'\b\d+(?:[\s,]*\d+)*(?:\.\d+)?\b', '', clean_text)
-        
-        # Убираем предлоги и служебные слова
-        prepositions = {
-            'ru': ['на', 'за', 'в', 'с', 'для', 'по', 'из', 'к', 'у', 'о', 'от', 'до', 'при', 'под'],
-            'en': ['on', 'for', 'in', 'with', 'to', 'from', 'at', 'by', 'of', 'the', 'a', 'an'],
-            'uz': ['uchun', 'bilan', 'dan', 'ga', 'da', 'ning', 'ni', 'va', 'yoki']
-        }
+        clean_text = self._strip_currency_amounts(clean_text)
         
-        for prep in prepositions.get(language, []):
-            pattern = rf'\b{re.escape(prep)}\b'
-            clean_text = re.sub(pattern, '', clean_text, flags=re.IGNORECASE)
+        # Убираем оставшиеся числа, предлоги и служебные слова
+        clean_re = self.number_and_preposition_regexes.get(language, STANDALONE_NUMBER_RE)
+        clean_text = clean_re.sub('', clean_text)
         
         # Очищаем и нормализуем
         description = ' '.join(clean_text.split()).strip()
@@ -702,49 +980,60 @@ class TextParserService:
         if not description or len(description) < 2:
             # Пытаемся извлечь из исходного текста без агрессивной очистки
             simple_clean = text
-            for keyword in all_keywords:
+            for keyword in self.transaction_keywords.get(language, ()):
                 simple_clean = simple_clean.replace(keyword, '', 1)
             
             # Убираем только числа с валютами
-            for currency, patterns in self.currency_patterns.items():
-                for pattern in patterns:
-                    simple_clean = re.sub(pattern, '', simple_clean, flags=re.IGNORECASE)
+            simple_clean = self._strip_currency_amounts(simple_clean)
             
             description = ' '.join(simple_clean.split()).strip()
             
             # Если всё ещё пустое - ставим значение по умолчанию
             if not description or len(description) < 2:
-                default_descriptions = {
-                    'ru': 'покупка',
-                    'en': 'purchase',
-                    'uz': 'xarid'
-                }
-                description = default_descriptions.get(language, 'покупка')
+                description = DEFAULT_DESCRIPTIONS.get(language, 'покупка')
         
         # Определяем категорию
         category = self._auto_detect_category(description, language)
         
         return description, category
     
-    def _auto_detect_category(self, description: str, language: str) -> str:
-        """Автоматически определяет категорию по описанию"""
+    def _strip_currency_amounts(self, text: str) -> str:
+        """Убирает из текста суммы с валютами (паттерны валют в порядке приоритета)"""
         
-        categories = self.auto_categories.get(language, {})
+        # Каждому паттерну валюты нужна цифра, а удаление сумм цифр не добавляет
+        if not DIGITS_RE.search(text):
+            return text
         
-        # Проверяем каждую категорию
-        for category_name, keywords in categories.items():
-            for keyword in keywords:
-                if keyword.lower() in description.lower():
-                    return category_name
+        for currency, patterns in self.currency_regexes.items():
+            # Обозначение проверяется на текущем тексте: после удаления сумм других
+            # валют оно могло склеиться из частей
+            if not self.currency_marker_regexes[currency].search(text):
+                continue
+            for pattern in patterns:
+                text = pattern.sub('', text)
+        
+        return text
+    
+    def _auto_detect_category(self, description: str, language: str) -> str:
+        """Автоматически определяет категорию по описанию (уже в нижнем регистре)"""
+        
+        # Описание целиком совпадает с ключевым словом - категория уже посчитана
+        category_name = self.keyword_categories.get(language, {}).get(description)
+        if category_name is None:
+            category_name = self._match_category(description, language)
         
         # Категория по умолчанию
-        default_categories = {
-            'ru': 'прочее',
-            'en': 'other', 
-            'uz': 'boshqa'
-        }
+        return category_name or DEFAULT_CATEGORIES.get(language, 'прочее')
+
+    def _match_category(self, description: str, language: str) -> Optional[str]:
+        """Первая по порядку категория, ключевое слово которой есть в описании"""
+        
+        # Проверяем категории по порядку: одно выражение на все ключевые слова категории
+        for category_name, keywords_re in self.category_regexes.get(language, []):
+            if keywords_re.search(description):
+                return category_name
         
-        return default_categories.get(language, 'прочее')
+        return None
 
     def get_currency_display_name(self, currency: str, language: str = 'ru') -> str:
         """Возвращает отображаемое название валюты"""
@@ -788,4 +1077,10 @@ class TextParserService:
         
         for case in test_cases:
             result = self.parse_transaction_text(case)
-            print(f"'{case}' -> {result}") 
\ No newline at end of file
+            print(f"'{case}' -> {result}")
+
+
+# Общий экземпляр парсера: словари и регулярные выражения строятся один раз на процесс.
+# После __init__ состояние экземпляра только читается, поэтому его безопасно
+# использовать из разных потоков бота и корутин
+text_parser_service = TextParserService()
@@ -3,8 +3,11 @@
 """
 
 import logging
+import uuid
 from decimal import Decimal
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
+from django.db import IntegrityError, transaction as db_transaction
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
 from asgiref.sync import sync_to_async
 
@@ -15,10 +18,36 @@ from .user_service import UserService
 
 logger = logging.getLogger(__name__)
 
+# Примерные курсы (в сумах за 1 единицу валюты), общие для всех конвертаций
+UZS_EXCHANGE_RATES = {
+    'USD': Decimal('12000'),
+    'EUR': Decimal('13000'),
+    'RUB': Decimal('130'),
+    'UZS': Decimal('1')
+}
+DEFAULT_UZS_RATE = Decimal('1')
+
+# Сколько закэшированных pk (пользователей и категорий) держать в памяти
+ID_CACHE_MAXSIZE = 10000
+
 
 class TransactionService:
     """Сервис для создания транзакций из голосовых команд"""
     
+    # (поле поиска User, значение) -> pk User. Общий для всех экземпляров: связь
+    # TelegramUser -> User не меняется, и повторный get_or_create на каждое
+    # сообщение не нужен
+    _user_id_cache: Dict[Tuple[str, str], uuid.UUID] = {}
+    # (pk User, название в нижнем регистре, тип) -> pk категории: набор категорий
+    # пользователя почти не меняется, а поиск по name__iexact шёл на каждую запись.
+    # Записи о переименованной или удалённой категории сбрасываются сигналами Category
+    # (см. BotConfig.ready). Изменения из других процессов и через QuerySet.update()
+    # сигналов не дают - такая запись живёт до вытеснения (удаление ловит повтор по IntegrityError)
+    _category_id_cache: Dict[Tuple[uuid.UUID, str, str], uuid.UUID] = {}
+    
+    # Сколько транзакций в одном INSERT у create_transactions_bulk
+    BULK_BATCH_SIZE = 500
+    
     def __init__(self):
         self.user_service = UserService()
     
@@ -52,27 +81,20 @@ class TransactionService:
                 logger.error(f"TelegramUser не найден для chat_id: {user_telegram_id}")
                 return None
             
-            # Получаем связанного User
-            user = self._get_or_create_user(telegram_user)
-            if not user:
+            # Получаем связанного User (только pk - сам объект для записи не нужен)
+            user_id = self._get_or_create_user_id(telegram_user)
+            if not user_id:
                 logger.error(f"Не удалось получить User для {user_telegram_id}")
                 return None
             
-            # Получаем категорию
-            category = self._get_or_create_category(
-                user=user,
-                category_name=parsed_data.get('category', 'другое'),
-                transaction_type=parsed_data['type']
-            )
-            
-            # Создаем транзакцию
-            transaction = Transaction.objects.create(
-                user=user,
-                type=parsed_data['type'],
+            # Создаем транзакцию в категории (найденной или новой)
+            transaction = self._save_transaction(
+                telegram_user,
+                user_id,
+                transaction_type=parsed_data['type'],
                 amount=parsed_data['amount'],
-                category=category,
-                description=parsed_data.get('description', ''),
-                date=timezone.now()
+                category_name=parsed_data.get('category', 'другое'),
+                description=parsed_data.get('description', '')
             )
             
             logger.info(f"Создана транзакция {transaction.id} для пользователя {user_telegram_id}")
@@ -113,9 +135,9 @@ class TransactionService:
                 logger.error(f"TelegramUser не найден для chat_id: {user_telegram_id}")
                 return None
             
-            # Получаем связанного User
-            user = self._get_or_create_user(telegram_user)
-            if not user:
+            # Получаем связанного User (только pk - сам объект для записи не нужен)
+            user_id = self._get_or_create_user_id(telegram_user)
+            if not user_id:
                 logger.error(f"Не удалось получить User для {user_telegram_id}")
                 return None
             
@@ -126,21 +148,14 @@ class TransactionService:
                 to_currency=telegram_user.preferred_currency
             )
             
-            # Получаем или создаем категорию
-            category = self._get_or_create_category(
-                user=user,
-                category_name=parsed_data.get('category', 'прочее'),
-                transaction_type=parsed_data['type']
-            )
-            
-            # Создаем транзакцию
-            transaction = Transaction.objects.create(
-                user=user,
-                type=parsed_data['type'],
+            # Создаем транзакцию в категории (найденной или новой)
+            transaction = self._save_transaction(
+                telegram_user,
+                user_id,
+                transaction_type=parsed_data['type'],
                 amount=amount,
-                category=category,
-                description=parsed_data.get('description', ''),
-                date=timezone.now()
+                category_name=parsed_data.get('category', 'прочее'),
+                description=parsed_data.get('description', '')
             )
             
             logger.info(f"Создана транзакция из текста {transaction.id} для пользователя {user_telegram_id}")
@@ -150,6 +165,115 @@ class TransactionService:
             logger.error(f"Ошибка создания транзакции из текста: {e}")
             return None
 
+    @sync_to_async
+    def create_transactions_bulk(
+        self,
+        user_telegram_id: int,
+        items: List[Dict[str, Any]]
+    ) -> List[Transaction]:
+        """
+        Создает несколько транзакций пользователя пачкой INSERT (например, позиции чека)
+        
+        Args:
+            user_telegram_id: Telegram ID пользователя
+            items: Данные транзакций в том же формате, что и parsed_data
+                   у create_transaction_from_voice
+        
+        Returns:
+            List[Transaction]: Созданные транзакции или пустой список при ошибке
+        """
+        if not items:
+            return []
+        
+        try:
+            # Получаем пользователя Telegram
+            telegram_user = self.user_service.get_user_by_chat_id_sync(user_telegram_id)
+            if not telegram_user:
+                logger.error(f"TelegramUser не найден для chat_id: {user_telegram_id}")
+                return []
+            
+            try:
+                transactions = self._bulk_insert_transactions(telegram_user, items)
+            except IntegrityError:
+                # pk из кэшей устарели (User или категорию успели удалить) -
+                # пачка откатилась целиком, повторяем с данными из БД
+                self._user_id_cache.clear()
+                self._category_id_cache.clear()
+                transactions = self._bulk_insert_transactions(telegram_user, items)
+            
+            logger.info(f"Создано {len(transactions)} транзакций для пользователя {user_telegram_id}")
+            return transactions
+            
+        except Exception as e:
+            logger.error(f"Ошибка пакетного создания транзакций: {e}")
+            return []
+    
+    def _bulk_insert_transactions(self, telegram_user, items: List[Dict[str, Any]]) -> List[Transaction]:
+        """Записывает все транзакции одной транзакцией БД: пачка сохраняется целиком или никак"""
+        user_id = self._get_or_create_user_id(telegram_user)
+        if not user_id:
+            raise ValueError(f"Не удалось получить User для {telegram_user.telegram_chat_id}")
+        
+        now = timezone.now()
+        transactions = [
+            Transaction(
+                user_id=user_id,
+                type=item['type'],
+                amount=item['amount'],
+                category_id=self._get_category_id(user_id, item.get('category', 'прочее'), item['type']),
+                description=item.get('description', ''),
+                date=now
+            )
+            for item in items
+        ]
+        
+        with db_transaction.atomic():
+            return Transaction.objects.bulk_create(transactions, batch_size=self.BULK_BATCH_SIZE)
+    
+    def _save_transaction(
+        self,
+        telegram_user,
+        user_id: uuid.UUID,
+        transaction_type: str,
+        amount: Decimal,
+        category_name: str,
+        description: str
+    ) -> Transaction:
+        """
+        Создает транзакцию по pk пользователя и категории из кэшей
+        
+        Если запись не прошла проверку внешних ключей (User или категорию успели
+        удалить), кэши сбрасываются и попытка повторяется с данными из БД
+        """
+        try:
+            return self._insert_transaction(user_id, transaction_type, amount, category_name, description)
+        except IntegrityError:
+            self._user_id_cache.clear()
+            self._category_id_cache.clear()
+            
+            user_id = self._get_or_create_user_id(telegram_user)
+            if not user_id:
+                raise
+            return self._insert_transaction(user_id, transaction_type, amount, category_name, description)
+    
+    def _insert_transaction(
+        self,
+        user_id: uuid.UUID,
+        transaction_type: str,
+        amount: Decimal,
+        category_name: str,
+        description: str
+    ) -> Transaction:
+        """INSERT транзакции без загрузки объектов User и Category"""
+        return Transaction.objects.create(
+            user_id=user_id,
+            type=transaction_type,
+            amount=amount,
+            category_id=self._get_category_id(user_id, category_name, transaction_type),
+            description=description,
+            date=timezone.now()
+        )
+    
     def _convert_currency(self, amount: Decimal, from_currency: str, to_currency: str) -> Decimal:
         """
         Конвертирует сумму из одной валюты в другую
@@ -160,18 +284,10 @@ class TransactionService:
         if from_currency == to_currency:
             return amount
         
-        # Примерные курсы (в сумах за 1 единицу валюты)
-        exchange_rates = {
-            'USD': Decimal('12000'),
-            'EUR': Decimal('13000'), 
-            'RUB': Decimal('130'),
-            'UZS': Decimal('1')
-        }
-        
         try:
             # Конвертируем в сумы, затем в целевую валюту
-            amount_in_uzs = amount * exchange_rates.get(from_currency, Decimal('1'))
-            result = amount_in_uzs / exchange_rates.get(to_currency, Decimal('1'))
+            amount_in_uzs = amount * UZS_EXCHANGE_RATES.get(from_currency, DEFAULT_UZS_RATE)
+            result = amount_in_uzs / UZS_EXCHANGE_RATES.get(to_currency, DEFAULT_UZS_RATE)
             
             logger.info(f"Конвертировано {amount} {from_currency} в {result} {to_currency}")
             return result
@@ -180,6 +296,79 @@ class TransactionService:
             logger.error(f"Ошибка конвертации валюты: {e}")
             return amount
     
+    def _get_or_create_user_id(self, telegram_user) -> Optional[uuid.UUID]:
+        """pk User для TelegramUser: запрос к БД только при первом обращении"""
+        lookup = self._user_lookup(telegram_user)
+        
+        user_id = self._user_id_cache.get(lookup)
+        if user_id is not None:
+            return user_id
+        
+        user = self._get_or_create_user(telegram_user)
+        if not user:
+            return None
+        
+        self._remember(self._user_id_cache, lookup, user.pk)
+        return user.pk
+    
+    def _get_category_id(
+        self,
+        user_id: uuid.UUID,
+        category_name: str,
+        transaction_type: str
+    ) -> Optional[uuid.UUID]:
+        """pk категории пользователя: запрос к БД только при первом обращении"""
+        lookup = (user_id, category_name.lower(), transaction_type)
+        
+        category_id = self._category_id_cache.get(lookup)
+        if category_id is not None:
+            return category_id
+        
+        category = self._get_or_create_category(
+            user_id=user_id,
+            category_name=category_name,
+            transaction_type=transaction_type
+        )
+        if not category:
+            return None
+        
+        # Запасную категорию по умолчанию (при ошибке) не запоминаем под чужим названием
+        if category.name.lower() == lookup[1]:
+            self._remember(self._category_id_cache, lookup, category.pk)
+        
+        return category.pk
+    
+    @classmethod
+    def forget_category(cls, category_id: uuid.UUID) -> None:
+        """Убирает из кэша все названия, указывающие на категорию"""
+        cache = cls._category_id_cache
+        try:
+            stale = [key for key, value in list(cache.items()) if value == category_id]
+        except RuntimeError:
+            # Кэш одновременно меняется из другого потока - сбрасываем его целиком
+            cache.clear()
+            return
+        for key in stale:
+            cache.pop(key, None)
+    
+    @staticmethod
+    def _remember(cache: Dict[Any, uuid.UUID], key: Any, value: uuid.UUID) -> None:
+        """Сохраняет pk в кэше, вытесняя самую старую запись при переполнении"""
+        if len(cache) >= ID_CACHE_MAXSIZE:
+            try:
+                cache.pop(next(iter(cache)), None)
+            except (StopIteration, RuntimeError):
+                # Кэш одновременно меняется из другого потока - пропускаем вытеснение
+                pass
+        cache[key] = value
+    
+    @staticmethod
+    def _user_lookup(telegram_user) -> Tuple[str, str]:
+        """Поле и значение, по которым _get_or_create_user ищет User"""
+        if telegram_user.phone_number:
+            return 'phone_number', telegram_user.phone_number
+        return 'username', telegram_user.username or f"tg_{telegram_user.telegram_user_id}"
+    
     def _get_or_create_user(self, telegram_user) -> Optional[User]:
         """Получает или создает User на основе TelegramUser"""
         try:
@@ -217,7 +406,7 @@ class TransactionService:
     
     def _get_or_create_category(
         self,
-        user: User,
+        user_id: uuid.UUID,
         category_name: str,
         transaction_type: str
     ) -> Optional[Category]:
@@ -225,7 +414,7 @@ class TransactionService:
         try:
             # Ищем существующую категорию (нечувствительно к регистру)
             category = Category.objects.filter(
-                user=user,
+                user_id=user_id,
                 name__iexact=category_name,
                 type=transaction_type
             ).first()
@@ -235,7 +424,7 @@ class TransactionService:
             
             # Создаем новую категорию, используя get_or_create для предотвращения дублирования
             category, created = Category.objects.get_or_create(
-                user=user,
+                user_id=user_id,
                 name=category_name.title(),
                 type=transaction_type,
                 defaults={
@@ -255,7 +444,7 @@ class TransactionService:
             
             # Возвращаем дефолтную категорию
             default_category = Category.objects.filter(
-                user=user,
+                user_id=user_id,
                 type=transaction_type,
                 is_default=True
             ).first()
@@ -275,27 +464,28 @@ class TransactionService:
             if not telegram_user:
                 return Decimal('0'), {}
             
-            user = self._get_or_create_user(telegram_user)
-            if not user:
+            user_id = self._get_or_create_user_id(telegram_user)
+            if not user_id:
                 return Decimal('0'), {}
             
-            # Считаем баланс
-            transactions = Transaction.objects.filter(user=user)
-            
-            total_income = sum(
-                t.amount for t in transactions.filter(type='income')
-            )
-            total_expense = sum(
-                t.amount for t in transactions.filter(type='expense')
+            # Считаем баланс одним запросом (SUM/COUNT ... FILTER) вместо загрузки
+            # всех транзакций пользователя и суммирования в Python
+            totals = Transaction.objects.filter(user_id=user_id).aggregate(
+                total_income=Sum('amount', filter=Q(type='income')),
+                total_expense=Sum('amount', filter=Q(type='expense')),
+                transactions_count=Count('id'),
             )
             
+            total_income = totals['total_income'] or Decimal('0')
+            total_expense = totals['total_expense'] or Decimal('0')
+            
             balance = total_income - total_expense
             
             stats = {
                 'total_income': total_income,
                 'total_expense': total_expense,
                 'balance': balance,
-                'transactions_count': transactions.count()
+                'transactions_count': totals['transactions_count']
             }
             
             return balance, stats
@@ -5,6 +5,8 @@
 import logging
 from typing import Dict, Any, Optional
 from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.utils import timezone
 
 from ..models import TelegramUser, BotSession
 
@@ -121,13 +123,25 @@ class UserService:
         try:
             @sync_to_async
             def set_state():
-                session, created = BotSession.objects.get_or_create(
+                active_sessions = BotSession.objects.filter(
                     user__telegram_chat_id=chat_id,
-                    defaults={'state': state}
+                    is_active=True
                 )
-                if not created:
-                    session.state = state
-                    session.save()
+                
+                def update_state():
+                    now = timezone.now()
+                    return active_sessions.update(state=state, last_activity=now, updated_at=now)
+                
+                # Обычный случай - активная сессия уже есть: один UPDATE без SELECT
+                if update_state():
+                    return True
+                
+                with transaction.atomic():
+                    # Блокируем строку пользователя, чтобы параллельные обновления
+                    # не создали ему две активные сессии
+                    user = TelegramUser.objects.select_for_update().get(telegram_chat_id=chat_id)
+                    if not update_state():
+                        BotSession.objects.create(user=user, state=state)
                 return True
             
             return await set_state()
@@ -157,15 +171,17 @@ class UserService:
         try:
             @sync_to_async
             def update_activity():
-                user = TelegramUser.objects.get(telegram_chat_id=chat_id)
-                user.save()  # updated_at обновится автоматически
-                return True
+                # Один UPDATE без предварительного SELECT и перезаписи всех полей
+                return TelegramUser.objects.filter(
+                    telegram_chat_id=chat_id
+                ).update(updated_at=timezone.now())
             
-            return await update_activity()
+            if not await update_activity():
+                logger.error(f"User not found for chat_id {chat_id}")
+                return False
+            
+            return True
             
-        except TelegramUser.DoesNotExist:
-            logger.error(f"User not found for chat_id {chat_id}")
-            return False
         except Exception as e:
             logger.error(f"Error updating user activity: {e}")
             return False
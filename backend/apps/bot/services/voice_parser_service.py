@@ -10,73 +10,125 @@ from typing import Dict, Any, Optional, List, Tuple
 logger = logging.getLogger(__name__)
 
 
+# Паттерны для поиска сумм (в порядке приоритета)
+AMOUNT_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'(\d+[\s,.]?\d*)\s*(?:сум|som|рубл|руб|доллар|usd|евро|eur)',  # С валютой
+        r'(\d+[\s,.]?\d*)\s*(?:тысяч|тыс|к)',  # Тысячи
+        r'(\d{1,3}(?:[\s,]\d{3})*(?:[.,]\d{2})?)',  # Числа с разделителями
+        r'(\d+[.,]?\d*)',  # Простые числа
+    )
+)
+
+NUMBER_RE = re.compile(r'\d+')
+
+
+def _compile_keywords(words: List[str]) -> Optional[re.Pattern]:
+    """
+    Собирает список ключевых слов в одно регулярное выражение.
+    
+    Поиск идёт через lookahead, поэтому находятся и перекрывающиеся вхождения
+    (например, 'расход' внутри 'израсходовал') - как при проверке `word in text`.
+    """
+    if not words:
+        return None
+    
+    alternation = '|'.join(
+        re.escape(word) for word in sorted(set(words), key=len, reverse=True)
+    )
+    return re.compile(f'(?=({alternation}))')
+
+
+def _count_keywords(matcher: Optional[re.Pattern], text: str) -> int:
+    """Считает количество различных ключевых слов, встречающихся в тексте"""
+    if matcher is None:
+        return 0
+    return len({match.group(1) for match in matcher.finditer(text)})
+
+
 class VoiceParserService:
     """Сервис для парсинга голосовых команд и извлечения данных о транзакциях"""
     
-    def __init__(self):
-        # Ключевые слова для определения типа транзакции
-        self.expense_keywords = {
-            'ru': [
-                'потратил', 'трата', 'купил', 'заплатил', 'оплатил', 'потрачено',
-                'расход', 'израсходовал', 'кто-то', 'минус', 'вычесть'
-            ],
-            'en': [
-                'spent', 'bought', 'paid', 'expense', 'cost', 'minus'
-            ],
-            'uz': [
-                'sarfladim', 'xarid', 'to\'ladim', 'chiqim'
-            ]
-        }
-        
-        self.income_keywords = {
-            'ru': [
-                'заработал', 'получил', 'доход', 'зарплата', 'прибыль',
-                'заработок', 'плюс', 'добавить', 'пришло'
-            ],
-            'en': [
-                'earned', 'received', 'income', 'salary', 'profit', 'plus'
-            ],
-            'uz': [
-                'topдim', 'olдim', 'daromad', 'maosh'
-            ]
-        }
-        
-        # Категории для автоклассификации
-        self.expense_categories = {
-            'ru': {
-                'еда': ['еда', 'продукты', 'магазин', 'ресторан', 'кафе', 'пицца', 'обед', 'ужин'],
-                'транспорт': ['такси', 'автобус', 'метро', 'бензин', 'билет', 'поездка'],
-                'покупки': ['одежда', 'обувь', 'магазин', 'покупки', 'шопинг'],
-                'здоровье': ['врач', 'лекарство', 'аптека', 'больница', 'таблетки'],
-                'развлечения': ['кино', 'театр', 'игры', 'концерт', 'клуб'],
-                'жкх': ['квартплата', 'коммуналка', 'свет', 'газ', 'вода', 'интернет'],
-                'другое': []
-            },
-            'en': {
-                'food': ['food', 'grocery', 'restaurant', 'cafe', 'lunch', 'dinner'],
-                'transport': ['taxi', 'bus', 'subway', 'gas', 'ticket', 'trip'],
-                'shopping': ['clothes', 'shoes', 'shopping', 'store'],
-                'health': ['doctor', 'medicine', 'pharmacy', 'hospital'],
-                'entertainment': ['movie', 'theater', 'games', 'concert'],
-                'utilities': ['rent', 'electricity', 'gas', 'water', 'internet'],
-                'other': []
-            }
+    # Ключевые слова для определения типа транзакции
+    expense_keywords = {
+        'ru': [
+            'потратил', 'трата', 'купил', 'заплатил', 'оплатил', 'потрачено',
+            'расход', 'израсходовал', 'кто-то', 'минус', 'вычесть'
+        ],
+        'en': [
+            'spent', 'bought', 'paid', 'expense', 'cost', 'minus'
+        ],
+        'uz': [
+            'sarfladim', 'xarid', 'to\'ladim', 'chiqim'
+        ]
+    }
+    
+    income_keywords = {
+        'ru': [
+            'заработал', 'получил', 'доход', 'зарплата', 'прибыль',
+            'заработок', 'плюс', 'добавить', 'пришло'
+        ],
+        'en': [
+            'earned', 'received', 'income', 'salary', 'profit', 'plus'
+        ],
+        'uz': [
+            'topдim', 'olдim', 'daromad', 'maosh'
+        ]
+    }
+    
+    # Категории для автоклассификации
+    expense_categories = {
+        'ru': {
+            'еда': ['еда', 'продукты', 'магазин', 'ресторан', 'кафе', 'пицца', 'обед', 'ужин'],
+            'транспорт': ['такси', 'автобус', 'метро', 'бензин', 'билет', 'поездка'],
+            'покупки': ['одежда', 'обувь', 'магазин', 'покупки', 'шопинг'],
+            'здоровье': ['врач', 'лекарство', 'аптека', 'больница', 'таблетки'],
+            'развлечения': ['кино', 'театр', 'игры', 'концерт', 'клуб'],
+            'жкх': ['квартплата', 'коммуналка', 'свет', 'газ', 'вода', 'интернет'],
+            'другое': []
+        },
+        'en': {
+            'food': ['food', 'grocery', 'restaurant', 'cafe', 'lunch', 'dinner'],
+            'transport': ['taxi', 'bus', 'subway', 'gas', 'ticket', 'trip'],
+            'shopping': ['clothes', 'shoes', 'shopping', 'store'],
+            'health': ['doctor', 'medicine', 'pharmacy', 'hospital'],
+            'entertainment': ['movie', 'theater', 'games', 'concert'],
+            'utilities': ['rent', 'electricity', 'gas', 'water', 'internet'],
+            'other': []
         }
-        
-        self.income_categories = {
-            'ru': {
-                'зарплата': ['зарплата', 'работа', 'оклад'],
-                'фриланс': ['фриланс', 'заказ', 'проект'],
-                'продажи': ['продал', 'продажа', 'реализация'],
-                'другое': []
-            },
-            'en': {
-                'salary': ['salary', 'wage', 'work'],
-                'freelance': ['freelance', 'project', 'order'],
-                'sales': ['sold', 'sale'],
-                'other': []
-            }
+    }
+    
+    income_categories = {
+        'ru': {
+            'зарплата': ['зарплата', 'работа', 'оклад'],
+            'фриланс': ['фриланс', 'заказ', 'проект'],
+            'продажи': ['продал', 'продажа', 'реализация'],
+            'другое': []
+        },
+        'en': {
+            'salary': ['salary', 'wage', 'work'],
+            'freelance': ['freelance', 'project', 'order'],
+            'sales': ['sold', 'sale'],
+            'other': []
         }
+    }
+    
+    # Скомпилированные матчеры собираются один раз при импорте модуля
+    _expense_matchers = {
+        lang: _compile_keywords(words) for lang, words in expense_keywords.items()
+    }
+    _income_matchers = {
+        lang: _compile_keywords(words) for lang, words in income_keywords.items()
+    }
+    _expense_category_matchers = {
+        lang: {category: _compile_keywords(words) for category, words in categories.items()}
+        for lang, categories in expense_categories.items()
+    }
+    _income_category_matchers = {
+        lang: {category: _compile_keywords(words) for category, words in categories.items()}
+        for lang, categories in income_categories.items()
+    }
     
     def parse_voice_text(self, text: str, language: str = 'ru') -> Optional[Dict[str, Any]]:
         """
@@ -132,11 +184,11 @@ class VoiceParserService:
     def _detect_transaction_type(self, text: str, language: str = 'ru') -> Optional[str]:
         """Определяет тип транзакции (доход/расход)"""
         
-        expense_words = self.expense_keywords.get(language, self.expense_keywords['ru'])
-        income_words = self.income_keywords.get(language, self.income_keywords['ru'])
+        expense_matcher = self._expense_matchers.get(language, self._expense_matchers['ru'])
+        income_matcher = self._income_matchers.get(language, self._income_matchers['ru'])
         
-        expense_score = sum(1 for word in expense_words if word in text)
-        income_score = sum(1 for word in income_words if word in text)
+        expense_score = _count_keywords(expense_matcher, text)
+        income_score = _count_keywords(income_matcher, text)
         
         if expense_score > income_score:
             return 'expense'
@@ -149,16 +201,8 @@ class VoiceParserService:
     def _extract_amount(self, text: str) -> Optional[Decimal]:
         """Извлекает сумму из текста"""
         
-        # Паттерны для поиска сумм
-        patterns = [
-            r'(\d+[\s,.]?\d*)\s*(?:сум|som|рубл|руб|доллар|usd|евро|eur)',  # С валютой
-            r'(\d+[\s,.]?\d*)\s*(?:тысяч|тыс|к)',  # Тысячи
-            r'(\d{1,3}(?:[\s,]\d{3})*(?:[.,]\d{2})?)',  # Числа с разделителями
-            r'(\d+[.,]?\d*)',  # Простые числа
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in AMOUNT_PATTERNS:
+            matches = pattern.findall(text)
             if matches:
                 for match in matches:
                     try:
@@ -183,16 +227,16 @@ class VoiceParserService:
         """Классифицирует категорию транзакции"""
         
         categories = (
-            self.expense_categories.get(language, self.expense_categories['ru'])
+            self._expense_category_matchers.get(language, self._expense_category_matchers['ru'])
             if transaction_type == 'expense'
-            else self.income_categories.get(language, self.income_categories['ru'])
+            else self._income_category_matchers.get(language, self._income_category_matchers['ru'])
         )
         
         best_category = None
         best_score = 0
         
-        for category, keywords in categories.items():
-            score = sum(1 for keyword in keywords if keyword in text)
+        for category, matcher in categories.items():
+            score = _count_keywords(matcher, text)
             if score > best_score:
                 best_score = score
                 best_category = category
@@ -263,7 +307,7 @@ class VoiceParserService:
         text = text.lower()
         
         # Проверяем наличие числа
-        has_number = bool(re.search(r'\d+', text))
+        has_number = bool(NUMBER_RE.search(text))
         
         # Проверяем наличие ключевых слов
         all_keywords = []
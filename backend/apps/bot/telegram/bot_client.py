@@ -4,7 +4,6 @@
 """
 
 import logging
-import asyncio
 import threading
 from typing import Dict, Any
 from django.conf import settings
@@ -14,6 +13,7 @@ from ..services.user_service import UserService
 from ..handlers.basic_handlers import BasicHandlers
 from ..handlers.voice_handlers import VoiceHandlers
 from ..handlers.photo_handlers import PhotoHandlers
+from ..utils.event_loop import run_async
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +26,7 @@ class TelegramBotClient:
     def __init__(self):
         self.telegram_api = TelegramAPIService()
         self.user_service = UserService()
+        self._local = threading.local()
         
         # Инициализируем обработчики
         self.basic_handlers = BasicHandlers()
@@ -41,10 +42,23 @@ class TelegramBotClient:
             '/settings': self.basic_handlers.handle_settings_command,
         }
     
-    def handle_update(self, update: Dict[str, Any]) -> None:
+    def handle_update(self, update: Dict[str, Any], wait: bool = False) -> None:
         """
         Основной метод обработки обновлений
+        
+        При wait=True дожидается завершения всех запущенных обработчиков
+        (нужно тестовым командам, которые проверяют результат сразу)
         """
+        if wait:
+            self._local.threads = []
+            try:
+                self.handle_update(update)
+            finally:
+                threads, self._local.threads = self._local.threads, None
+            for thread in threads:
+                thread.join()
+            return
+        
         try:
             logger.info(f"Processing update: {update}")
             
@@ -267,21 +281,33 @@ class TelegramBotClient:
         except Exception as e:
             logger.error(f"Error sending unsupported message info: {e}")
     
-    def _run_async_in_thread(self, coro) -> None:
+    def _run_async_in_thread(self, coro) -> threading.Thread:
         """
         Запускает асинхронную функцию в отдельном потоке
         """
-        def run_async():
+        async def run_with_session():
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.run_until_complete(coro)
-                loop.close()
+                await coro
+            finally:
+                # Общая HTTP-сессия цикла живёт до конца обработки обновления
+                await TelegramAPIService.close_session()
+        
+        def run_coroutine():
+            try:
+                # Свой event loop на поток (uvloop, если установлен);
+                # закрывается и при ошибке внутри обработчика
+                run_async(run_with_session())
             except Exception as e:
                 logger.error(f"Error in async thread: {e}")
         
-        thread = threading.Thread(target=run_async)
+        thread = threading.Thread(target=run_coroutine)
         thread.start()
+        
+        # handle_update(wait=True) собирает потоки текущего обновления
+        threads = getattr(self._local, 'threads', None)
+        if threads is not None:
+            threads.append(thread)
+        return thread
     
     def get_bot_info(self) -> Dict[str, Any]:
         """Возвращает информацию о боте"""
@@ -0,0 +1,30 @@
+"""
+Вспомогательные функции для вывода management команд
+"""
+
+import io
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.core.management.base import BaseCommand, OutputWrapper
+
+
+@contextmanager
+def buffered_output(command: BaseCommand) -> Iterator[None]:
+    """
+    Копит весь вывод команды в памяти и пишет его в stdout одним вызовом
+
+    Подходит для быстрых команд с большим количеством строк вывода, где
+    отдельный write() на каждую строку занимает больше времени, чем сама работа.
+    Стили (self.style.*) применяются до записи, поэтому цвета сохраняются.
+    """
+    stdout = command.stdout
+    buffer = io.StringIO()
+    command.stdout = OutputWrapper(buffer)
+
+    try:
+        yield
+    finally:
+        command.stdout = stdout
+        stdout.write(buffer.getvalue(), ending='')
+        stdout.flush()
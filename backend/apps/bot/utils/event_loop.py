@@ -0,0 +1,25 @@
+"""
+Запуск асинхронного кода из синхронного (management команды, потоки бота)
+"""
+
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+try:
+    import uvloop
+except ImportError:  # uvloop необязателен (и недоступен на Windows)
+    uvloop = None
+
+T = TypeVar('T')
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Выполняет корутину в новом event loop, как asyncio.run
+
+    Если установлен uvloop, используется его цикл событий - он быстрее
+    стандартного на сетевых операциях и запуске подпроцессов.
+    """
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
@@ -3,6 +3,7 @@
 Поддерживает русский, английский и узбекский языки
 """
 
+from functools import lru_cache
 from typing import Dict, Any
 
 
@@ -328,11 +329,7 @@ class BotTranslations:
         Returns:
             Переведённый текст
         """
-        if language not in cls.TRANSLATIONS:
-            language = 'ru'  # Fallback to Russian
-        
-        translations = cls.TRANSLATIONS[language]
-        text = translations.get(key, cls.TRANSLATIONS['ru'].get(key, f'[Missing: {key}]'))
+        text = cls._lookup(key, language)
         
         if kwargs:
             try:
@@ -343,6 +340,19 @@ class BotTranslations:
         return text
     
     @classmethod
+    @lru_cache(maxsize=512)
+    def _lookup(cls, key: str, language: str) -> str:
+        """Ищет шаблон перевода с фолбэком на русский (результат кэшируется)"""
+        if language not in cls.TRANSLATIONS:
+            language = 'ru'  # Fallback to Russian
+        
+        translations = cls.TRANSLATIONS[language]
+        return translations.get(key, cls.TRANSLATIONS['ru'].get(key, f'[Missing: {key}]'))
+    
+    # Клавиатуры ниже кэшируются и возвращаются как общий объект - не изменяйте их
+    
+    @classmethod
+    @lru_cache(maxsize=1)
     def get_language_keyboard(cls) -> Dict[str, Any]:
         """Возвращает клавиатуру выбора языка"""
         return {
@@ -355,6 +365,7 @@ class BotTranslations:
         }
     
     @classmethod
+    @lru_cache(maxsize=32)
     def get_currency_keyboard(cls, language: str = 'ru') -> Dict[str, Any]:
         """Возвращает клавиатуру выбора валюты"""
         return {
@@ -367,6 +378,7 @@ class BotTranslations:
         }
     
     @classmethod
+    @lru_cache(maxsize=32)
     def get_settings_keyboard(cls, language: str = 'ru') -> Dict[str, Any]:
         """Возвращает клавиатуру настроек"""
         return {
@@ -380,6 +392,7 @@ class BotTranslations:
         }
     
     @classmethod
+    @lru_cache(maxsize=32)
     def get_main_menu_keyboard(cls, language: str = 'ru') -> Dict[str, Any]:
         """Возвращает главную клавиатуру меню"""
         return {
@@ -392,6 +405,18 @@ class BotTranslations:
             'resize_keyboard': True
         }
 
+    
+    @classmethod
+    def warm_up(cls) -> None:
+        """Заранее заполняет кэши переводов и клавиатур для всех языков"""
+        cls.get_language_keyboard()
+        for language, translations in cls.TRANSLATIONS.items():
+            for key in translations:
+                cls._lookup(key, language)
+            cls.get_currency_keyboard(language)
+            cls.get_settings_keyboard(language)
+            cls.get_main_menu_keyboard(language)
+
 
 # Глобальный объект для удобного использования
 t = BotTranslations() 
\ No newline at end of file
@@ -1,15 +1,16 @@
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
 from apps.bot.models import VoiceCommand, BotSession
-from apps.bot.serializers import VoiceCommandLogSerializer, BotSessionSerializer
+from apps.bot.serializers import VoiceCommandLogSerializer, BotSessionSerializer, BotSessionStatusSerializer
 
 
 class VoiceCommandLogViewSet(viewsets.ModelViewSet):
-    queryset = VoiceCommand.objects.select_related('user').all()
+    queryset = VoiceCommand.objects.all()
     serializer_class = VoiceCommandLogSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -18,6 +19,10 @@ class VoiceCommandLogViewSet(viewsets.ModelViewSet):
     ordering_fields = ['received_at', 'created_at']
     ordering = ['-received_at']
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        return self.get_serializer_class().setup_eager_loading(queryset)
+
     @action(detail=False, methods=['get'])
     def user_stats(self, request):
         user_id = request.query_params.get('user_id')
@@ -36,7 +41,7 @@ class VoiceCommandLogViewSet(viewsets.ModelViewSet):
 
 
 class BotSessionViewSet(viewsets.ModelViewSet):
-    queryset = BotSession.objects.select_related('user').all()
+    queryset = BotSession.objects.all()
     serializer_class = BotSessionSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
@@ -44,6 +49,27 @@ class BotSessionViewSet(viewsets.ModelViewSet):
     ordering_fields = ['started_at', 'last_activity_at']
     ordering = ['-started_at']
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        return self.get_serializer_class().setup_eager_loading(queryset)
+
+    @action(detail=False, methods=['get'])
+    def status(self, request):
+        user_id = request.query_params.get('user_id')
+        
+        if not user_id:
+            return Response({'error': 'user_id is required'}, status=400)
+        
+        try:
+            # Только три колонки, без context_data и JOIN пользователя
+            sessions = list(
+                BotSession.objects.filter(user_id=user_id).values('is_active', 'last_activity', 'state')
+            )
+        except DjangoValidationError:
+            return Response({'error': 'Invalid user_id'}, status=400)
+        
+        return Response(BotSessionStatusSerializer(sessions, many=True).data)
+
     @action(detail=True, methods=['post'])
     def end_session(self, request, pk=None):
         session = self.get_object()
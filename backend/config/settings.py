@@ -242,6 +242,9 @@ PAYME_PASSWORD = os.environ.get('PAYME_PASSWORD', '')
 
 BOT_TOKEN = os.environ.get('BOT_TOKEN', '')
 
+# Загружать модель Whisper при старте процесса, а не на первом голосовом
+WHISPER_PREWARM = os.environ.get('WHISPER_PREWARM', 'False') == 'True'
+
 # Настройки Jazzmin
 JAZZMIN_SETTINGS = {
     # title of the window (Will default to current_admin_site.site_title if absent or None)
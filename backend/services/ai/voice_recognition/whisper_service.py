@@ -3,20 +3,155 @@ WhisperService - Локальное распознавание речи чере
 Поддерживает русский, узбекский и английский языки
 """
 
+import io
 import os
+import json
 import asyncio
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from pathlib import Path
 import subprocess
 import tempfile
+import threading
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# Загруженные модели Whisper живут на уровне процесса и переиспользуются
+# между запросами: повторная загрузка весов на каждое сообщение съедает
+# большую часть времени распознавания коротких голосовых.
+# Значение - пара (бэкенд, модель), бэкенд: 'faster' или 'openai'
+_models: Dict[str, Tuple[str, Any]] = {}
+_models_lock = threading.Lock()
+
+
+# Файл с отметками о проверенных чекпоинтах openai-whisper (в каталоге моделей)
+_CHECKPOINT_INDEX = 'ovozpay_index.json'
+
+
+def _whisper_cache_dir() -> str:
+    """Каталог с весами openai-whisper (тот же, что использует сам whisper)"""
+    default = os.path.join(
+        os.getenv('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'whisper'
+    )
+    return getattr(settings, 'WHISPER_MODEL_DIR', None) or default
+
+
+def _read_checkpoint_index(cache_dir: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(cache_dir, _CHECKPOINT_INDEX), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _verified_checkpoint(model_name: str, cache_dir: str) -> Optional[str]:
+    """
+    Возвращает путь к уже проверенному чекпоинту openai-whisper.
+    
+    whisper.load_model(name) при каждой загрузке перечитывает весь .pt файл
+    ради проверки SHA256. Если файл не менялся с прошлой проверки (совпадают
+    размер и mtime), грузим его напрямую по пути и пропускаем эту проверку.
+    """
+    entry = _read_checkpoint_index(cache_dir).get(model_name)
+    if not entry:
+        return None
+    
+    path = os.path.join(cache_dir, entry['file'])
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    
+    if stat.st_size != entry['size'] or stat.st_mtime_ns != entry['mtime_ns']:
+        return None
+    return path
+
+
+def _remember_checkpoint(model_name: str, cache_dir: str, file_name: str) -> None:
+    """Запоминает размер и mtime чекпоинта, только что проверенного whisper"""
+    path = os.path.join(cache_dir, file_name)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return
+    
+    index = _read_checkpoint_index(cache_dir)
+    index[model_name] = {
+        'file': file_name,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+    
+    # Пишем во временный файл и атомарно подменяем индекс
+    index_path = os.path.join(cache_dir, _CHECKPOINT_INDEX)
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        logger.debug(f"Не удалось сохранить индекс моделей Whisper: {e}")
+
+
+def _load_openai_model(model_name: str) -> Any:
+    """Загружает модель openai-whisper, переиспользуя проверенный чекпоинт"""
+    import whisper
+    
+    cache_dir = _whisper_cache_dir()
+    checkpoint = _verified_checkpoint(model_name, cache_dir)
+    if checkpoint:
+        model = whisper.load_model(checkpoint)
+        # При загрузке по пути whisper не знает имя модели - восстанавливаем
+        # alignment heads сами, чтобы поведение не отличалось
+        alignment_heads = getattr(whisper, '_ALIGNMENT_HEADS', {}).get(model_name)
+        if alignment_heads:
+            model.set_alignment_heads(alignment_heads)
+        return model
+    
+    model = whisper.load_model(model_name, download_root=cache_dir)
+    
+    url = getattr(whisper, '_MODELS', {}).get(model_name)
+    if url:
+        _remember_checkpoint(model_name, cache_dir, os.path.basename(url))
+    
+    return model
+
+
+def _load_model(model_name: str) -> Tuple[str, Any]:
+    """
+    Загружает модель Whisper.
+    
+    Предпочитает faster-whisper (CTranslate2, int8 на CPU) - он в несколько раз
+    быстрее PyTorch-версии; при его отсутствии используется openai-whisper.
+    Уже скачанные веса берутся с диска без обращений к сети и повторных проверок.
+    """
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        return 'openai', _load_openai_model(model_name)
+    
+    model_kwargs = dict(
+        device=getattr(settings, 'WHISPER_DEVICE', 'cpu'),
+        compute_type=getattr(settings, 'WHISPER_COMPUTE_TYPE', 'int8'),
+        cpu_threads=getattr(settings, 'WHISPER_CPU_THREADS', 4),
+        num_workers=1,
+        download_root=getattr(settings, 'WHISPER_MODEL_DIR', None)
+    )
+    
+    try:
+        # Сначала только локальный кэш: без запроса к Hugging Face Hub
+        # на проверку обновлений при каждом старте
+        model = WhisperModel(model_name, local_files_only=True, **model_kwargs)
+    except (OSError, ValueError):
+        logger.info(f"Модель Whisper '{model_name}' не найдена в кэше, скачиваем")
+        model = WhisperModel(model_name, **model_kwargs)
+    
+    return 'faster', model
+
 
 class WhisperService:
-    """Сервис для распознавания речи через OpenAI Whisper (локально)"""
+    """Сервис для распознавания речи через Whisper (локально, faster-whisper или OpenAI Whisper)"""
     
     def __init__(self):
         # ОПТИМИЗАЦИЯ: Используем самую быструю модель по умолчанию
@@ -28,6 +163,99 @@ class WhisperService:
         # Проверяем установлен ли Whisper
         self._check_whisper_installation()
     
+    def _get_model(self) -> Tuple[str, Any]:
+        """Возвращает (бэкенд, модель) Whisper (ленивая инициализация, одна на процесс)"""
+        loaded = _models.get(self.model_name)
+        if loaded is not None:
+            return loaded
+        
+        with _models_lock:
+            loaded = _models.get(self.model_name)
+            if loaded is None:
+                loaded = _load_model(self.model_name)
+                _models[self.model_name] = loaded
+                logger.info(f"Модель Whisper '{self.model_name}' загружена ({loaded[0]})")
+        
+        return loaded
+    
+    def _transcribe_with_model(self, audio, language: str) -> Dict[str, Any]:
+        """
+        Синхронное распознавание загруженной моделью (выполняется в executor)
+        
+        Args:
+            audio: Путь к файлу, файловый объект (faster-whisper)
+                или массив float32 (16 кГц, моно)
+            language: Язык распознавания
+        """
+        backend, model = self._get_model()
+        
+        if backend == 'faster':
+            segments, info = model.transcribe(
+                audio,
+                language=language,
+                task='transcribe',
+                beam_size=1,
+                temperature=0,
+                vad_filter=True
+            )
+            # segments - ленивый генератор, декодирование идёт при итерации
+            segments = [
+                {
+                    'start': segment.start,
+                    'end': segment.end,
+                    'text': segment.text,
+                    'avg_logprob': segment.avg_logprob
+                }
+                for segment in segments
+            ]
+            return {
+                'text': ''.join(segment['text'] for segment in segments),
+                'language': info.language,
+                'duration': info.duration,
+                'segments': segments
+            }
+        
+        return model.transcribe(
+            audio,
+            language=language,
+            task='transcribe',
+            fp16=False,
+            temperature=0,
+            beam_size=1,
+            verbose=None
+        )
+    
+    def _transcribe_bytes_with_model(self, audio_bytes: bytes, language: str) -> Dict[str, Any]:
+        """Декодирует аудио из памяти и распознаёт его загруженной моделью"""
+        # Загружаем модель до декодирования: без пакетов whisper сразу получаем ImportError
+        backend, _ = self._get_model()
+        
+        if backend == 'faster':
+            # faster-whisper сам декодирует файловый объект через PyAV
+            return self._transcribe_with_model(io.BytesIO(audio_bytes), language)
+        
+        return self._transcribe_with_model(self._decode_audio_bytes(audio_bytes), language)
+    
+    @staticmethod
+    def _decode_audio_bytes(audio_bytes: bytes):
+        """Декодирует аудио в 16 кГц моно float32 через ffmpeg (stdin -> stdout, без диска)"""
+        import numpy as np
+        
+        command = [
+            'ffmpeg',
+            '-hide_banner',
+            '-loglevel', 'error',
+            '-threads', '0',
+            '-i', 'pipe:0',
+            '-f', 's16le',
+            '-ac', '1',
+            '-acodec', 'pcm_s16le',
+            '-ar', '16000',
+            'pipe:1'
+        ]
+        process = subprocess.run(command, input=audio_bytes, capture_output=True, check=True)
+        return np.frombuffer(process.stdout, np.int16).astype(np.float32) / 32768.0
+    
     def _check_whisper_installation(self) -> None:
         """Проверяет установлен ли OpenAI Whisper"""
         try:
@@ -77,40 +305,132 @@ class WhisperService:
             # ОПТИМИЗАЦИЯ: Запускаем Whisper в отдельном процессе с минимальными параметрами
             result = await self._run_optimized_whisper_transcription(audio_file_path, language)
             
-            # Обрабатываем результат
-            if result and result.get('text'):
-                processing_time = asyncio.get_event_loop().time() - start_time
+            return self._build_transcription_result(result, language, start_time)
                 
-                transcription_result = {
-                    'text': result['text'].strip(),
-                    'language': result.get('language', language),
-                    'confidence': self._calculate_confidence(result),
-                    'processing_time': processing_time,
-                    'audio_duration': result.get('duration', 0),
-                    'segments': result.get('segments', [])
-                }
-                
-                logger.info(
-                    f"⚡ БЫСТРОЕ распознавание завершено за {processing_time:.1f}с: "
-                    f"'{transcription_result['text'][:30]}...'"
+        except Exception as e:
+            processing_time = asyncio.get_event_loop().time() - start_time
+            logger.error(f"Ошибка распознавания аудио за {processing_time:.1f}с: {e}")
+            return None
+    
+    async def transcribe_audio_bytes(
+        self,
+        audio_bytes: bytes,
+        language: str = 'ru',
+        user_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Преобразует аудио из памяти в текст без записи во временный файл
+        
+        Args:
+            audio_bytes: Содержимое аудио файла (ogg/opus от Telegram и т.п.)
+            language: Язык распознавания (ru, uz, en)
+            user_id: ID пользователя для логирования
+            
+        Returns:
+            Словарь с результатом распознавания или None при ошибке
+        """
+        start_time = asyncio.get_event_loop().time()
+        
+        try:
+            if not audio_bytes:
+                raise ValueError("Пустые аудио данные")
+            
+            if language not in self.supported_languages:
+                logger.warning(f"Неподдерживаемый язык {language}, используем 'ru'")
+                language = 'ru'
+            
+            logger.info(f"🎤 Начинаем распознавание аудио из памяти для пользователя {user_id}")
+            
+            loop = asyncio.get_running_loop()
+            try:
+                result = await asyncio.wait_for(
+                    loop.run_in_executor(
+                        None, self._transcribe_bytes_with_model, audio_bytes, language
+                    ),
+                    timeout=25
                 )
-                
-                return transcription_result
-            else:
-                logger.warning("Whisper не смог распознать текст")
-                return None
-                
+            except ImportError:
+                # Без пакета whisper остаётся только CLI, которому нужен файл на диске
+                return await self._transcribe_bytes_via_file(audio_bytes, language, user_id)
+            
+            return self._build_transcription_result(result, language, start_time)
+            
         except Exception as e:
             processing_time = asyncio.get_event_loop().time() - start_time
             logger.error(f"Ошибка распознавания аудио за {processing_time:.1f}с: {e}")
             return None
     
+    async def _transcribe_bytes_via_file(
+        self,
+        audio_bytes: bytes,
+        language: str,
+        user_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Распознаёт аудио из памяти через временный файл (для CLI)"""
+        with tempfile.NamedTemporaryFile(
+            suffix='.ogg', dir=self.temp_dir, delete=False
+        ) as temp_file:
+            temp_file.write(audio_bytes)
+        
+        try:
+            return await self.transcribe_audio(temp_file.name, language, user_id)
+        finally:
+            os.unlink(temp_file.name)
+    
+    def _build_transcription_result(
+        self,
+        result: Optional[Dict[str, Any]],
+        language: str,
+        start_time: float
+    ) -> Optional[Dict[str, Any]]:
+        """Формирует итоговый словарь из результата Whisper"""
+        if not result or not result.get('text'):
+            logger.warning("Whisper не смог распознать текст")
+            return None
+        
+        processing_time = asyncio.get_event_loop().time() - start_time
+        
+        transcription_result = {
+            'text': result['text'].strip(),
+            'language': result.get('language', language),
+            'confidence': self._calculate_confidence(result),
+            'processing_time': processing_time,
+            'audio_duration': result.get('duration', 0),
+            'segments': result.get('segments', [])
+        }
+        
+        logger.info(
+            f"⚡ БЫСТРОЕ распознавание завершено за {processing_time:.1f}с: "
+            f"'{transcription_result['text'][:30]}...'"
+        )
+        
+        return transcription_result
+    
     async def _run_optimized_whisper_transcription(
         self, 
         audio_file_path: str, 
         language: str
     ) -> Optional[Dict[str, Any]]:
         """ОПТИМИЗИРОВАННЫЙ запуск процесса распознавания Whisper"""
+        try:
+            # ОПТИМИЗАЦИЯ: Модель уже в памяти процесса - не поднимаем CLI
+            # и не грузим веса заново на каждое сообщение
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(
+                loop.run_in_executor(
+                    None, self._transcribe_with_model, audio_file_path, language
+                ),
+                timeout=25
+            )
+        except ImportError:
+            logger.debug("Пакет whisper недоступен, используем CLI")
+        except asyncio.TimeoutError:
+            logger.error("Тайм-аут при распознавании речи")
+            return None
+        except Exception as e:
+            logger.error(f"Ошибка распознавания моделью Whisper: {e}")
+            return None
+        
         try:
             # ОПТИМИЗАЦИЯ: Минимальная команда для максимальной скорости
             command = [
@@ -152,7 +472,6 @@ class WhisperService:
             json_file = self.temp_dir / f"{audio_filename}.json"
             
             if json_file.exists():
-                import json
                 with open(json_file, 'r', encoding='utf-8') as f:
                     result = json.load(f)
                 
@@ -214,6 +533,23 @@ class WhisperService:
         except Exception as e:
             logger.error(f"Ошибка очистки временных файлов: {e}")
     
+    def warm_up(self) -> bool:
+        """
+        Загружает модель и прогоняет через неё секунду тишины, чтобы первый
+        пользователь не ждал загрузки весов и инициализации бэкенда
+        
+        Returns:
+            bool: True если прогрев прошёл успешно
+        """
+        try:
+            import numpy as np
+            self._transcribe_with_model(np.zeros(16000, dtype=np.float32), 'ru')
+            logger.info(f"Whisper '{self.model_name}' прогрет")
+            return True
+        except Exception as e:
+            logger.warning(f"Не удалось прогреть Whisper: {e}")
+            return False
+    
     async def initialize(self) -> bool:
         """
         Инициализирует Whisper сервис